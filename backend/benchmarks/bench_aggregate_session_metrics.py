@@ -0,0 +1,162 @@
+"""
+Benchmark: ConfidenceScorer.aggregate_session_metrics (vectorized) vs the
+previous per-frame Python loop, from 100 to 100k frames
+
+Both paths read the same frame dicts end to end; walking the dicts dominates,
+so the speedup there is small. The server-side path stores frames in
+FrameColumns as they arrive, so the report only pays for
+aggregate_frame_columns; that is timed separately, on the frames FrameColumns
+accepts (those with every section), with and without building the columns.
+
+Run from backend/:  python benchmarks/bench_aggregate_session_metrics.py
+"""
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.session_metrics import FrameColumns
+from utils.scoring import ConfidenceScorer
+
+
+SIZES = (100, 1_000, 10_000, 100_000)
+
+
+def make_frames(count: int, seed: int = 7) -> List[Dict[str, Any]]:
+    """
+    Synthetic frame results shaped like VisionAnalyzer output (a few frames miss sections)
+    """
+    rng = random.Random(seed)
+    frames = []
+    for i in range(count):
+        frame = {
+            'eye_contact': {
+                'is_looking_at_camera': rng.random() > 0.3,
+                'gaze_score': rng.random(),
+                'looking_away_duration': rng.random() * 4
+            },
+            'posture': {
+                'is_upright': True,
+                'posture_score': 0.5 + rng.random() / 2,
+                'slouch_detected': rng.random() > 0.995,
+                'shoulder_alignment': rng.random()
+            },
+            'gestures': {
+                'hand_detected': True,
+                'gesture_count': rng.randint(0, 2),
+                'fidgeting_score': rng.random() / 2,
+                'hand_positions': ['lowered']
+            },
+            'expressions': {
+                'confidence_level': 0.6 + rng.random() * 0.4,
+                'smile_detected': False,
+                'expression_type': 'neutral',
+                'engagement_score': rng.random()
+            },
+            'overall_confidence': rng.random() * 100,
+            'timestamp': i * 0.5
+        }
+        if i % 97 == 0:
+            del frame['gestures']
+        frames.append(frame)
+    return frames
+
+
+def legacy_aggregate(frame_metrics: List[Dict[str, Any]]) -> Dict[str, float]:
+    """
+    The per-frame loop aggregate_session_metrics used before vectorization
+    """
+    gaze_scores, looking_away_durations, posture_scores = [], [], []
+    fidgeting_scores, gesture_counts, confidence_levels, engagement_scores = [], [], [], []
+    slouch_count = 0
+
+    for frame in frame_metrics:
+        if 'eye_contact' in frame:
+            gaze_scores.append(frame['eye_contact'].get('gaze_score', 0.5))
+            looking_away_durations.append(frame['eye_contact'].get('looking_away_duration', 0))
+        if 'posture' in frame:
+            posture_scores.append(frame['posture'].get('posture_score', 0.5))
+            if frame['posture'].get('slouch_detected', False):
+                slouch_count += 1
+        if 'gestures' in frame:
+            fidgeting_scores.append(frame['gestures'].get('fidgeting_score', 0.3))
+            gesture_counts.append(frame['gestures'].get('gesture_count', 0))
+        if 'expressions' in frame:
+            confidence_levels.append(frame['expressions'].get('confidence_level', 0.6))
+            engagement_scores.append(frame['expressions'].get('engagement_score', 0.6))
+
+    penalty = sum(
+        ConfidenceScorer.LOOKING_AWAY_PENALTY
+        for duration in looking_away_durations
+        if duration > ConfidenceScorer.LOOKING_AWAY_THRESHOLD
+    )
+    eye_contact = max(0, min(100, np.mean(gaze_scores) * 100 - penalty))
+    posture = max(0, min(100, np.mean(posture_scores) * 100 - slouch_count * ConfidenceScorer.SLOUCH_PENALTY))
+    gestures = (1 - np.mean(fidgeting_scores)) * 100
+    avg_gestures = np.mean(gesture_counts)
+    if avg_gestures > 5:
+        gestures -= (avg_gestures - 5) * 2
+    expressions = (np.mean(confidence_levels) * 0.6 + np.mean(engagement_scores) * 0.4) * 100
+
+    return {
+        'eye_contact_percentage': eye_contact,
+        'posture_score': posture,
+        'expression_confidence': max(0, min(100, expressions)),
+        'gesture_score': max(0, min(100, gestures))
+    }
+
+
+def best_of(func, *args, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def build_and_aggregate(frames: List[Dict[str, Any]]) -> Dict[str, float]:
+    store = FrameColumns(max_frames=len(frames))
+    for frame in frames:
+        store.append(frame)
+    return ConfidenceScorer.aggregate_frame_columns(store.columns())
+
+
+def main() -> None:
+    print("All frames, from dicts:")
+    print(f"{'frames':>8} {'loop ms':>10} {'dicts ms':>10} {'speedup':>8}")
+    for size in SIZES:
+        frames = make_frames(size)
+
+        expected = legacy_aggregate(frames)
+        actual = ConfidenceScorer.aggregate_session_metrics(frames)
+        assert actual == expected, (size, actual, expected)
+
+        loop_ms = best_of(legacy_aggregate, frames)
+        dicts_ms = best_of(ConfidenceScorer.aggregate_session_metrics, frames)
+        print(f"{size:>8} {loop_ms:>10.3f} {dicts_ms:>10.3f} {loop_ms / dicts_ms:>7.2f}x")
+
+    print()
+    print("Complete frames, server-side columns (build = append every frame, then aggregate):")
+    print(f"{'frames':>8} {'loop ms':>10} {'build ms':>10} {'columns ms':>11} {'columns vs loop':>16}")
+    for size in SIZES:
+        frames = [frame for frame in make_frames(size) if 'gestures' in frame]
+
+        store = FrameColumns(max_frames=len(frames))
+        for frame in frames:
+            store.append(frame)
+        columns = store.columns()
+
+        loop_ms = best_of(legacy_aggregate, frames)
+        build_ms = best_of(build_and_aggregate, frames)
+        columns_ms = best_of(ConfidenceScorer.aggregate_frame_columns, columns)
+        print(f"{len(frames):>8} {loop_ms:>10.3f} {build_ms:>10.3f} {columns_ms:>11.3f} {loop_ms / columns_ms:>15.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark: detect_filler_words (one pass of a precompiled, trie-factored
+word-boundary regex) vs the previous detect_filler_words (one str.count() scan
+per filler), on transcripts up to 200k words
+
+The matcher is not a speedup: it takes two to three times as long as the old
+scans, which were only plain substring counts and so also counted fillers
+inside other words ("so" in "also", "like" in "likely"). Their counts are
+reported but not compared; the new matcher is checked against a per-filler
+word-boundary reference instead. The extra cost is about 0.2 us per word, well under a
+millisecond for a typical answer.
+
+Run from backend/:  python benchmarks/bench_filler_words.py
+"""
+import os
+import random
+import re
+import sys
+import time
+from typing import Any, Dict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.scoring import FILLER_WORDS, detect_filler_words
+
+
+SIZES = (100, 1_000, 10_000, 100_000, 200_000)
+
+# Plain words, including near-misses the old substring counts picked up
+WORDS = (
+    'the', 'project', 'team', 'also', 'likely', 'bright', 'you', 'i', 'of',
+    'we', 'shipped', 'data', 'reasonable', 'umbrella', 'sorted', 'kindly',
+    'meaning', 'pipeline', 'latency', 'customers', 'design', 'tested', 'kind',
+    'know', 'mean', 'sort', 'because', 'Then', 'results.', 'improved,'
+)
+FILLERS = (
+    'um', 'uh', 'like', 'you know', 'So,', 'actually', 'basically', 'literally',
+    'right', 'okay', 'Well,', 'I mean', 'kind of', 'sort of'
+)
+FILLER_RATE = 0.08
+
+
+def make_transcript(words: int, seed: int = 11) -> str:
+    rng = random.Random(seed)
+    return ' '.join(
+        rng.choice(FILLERS) if rng.random() < FILLER_RATE else rng.choice(WORDS)
+        for _ in range(words)
+    )
+
+
+def legacy_detect(text: str) -> Dict[str, Any]:
+    """
+    The per-filler substring counting detect_filler_words used before,
+    including its word split for the total word count
+    """
+    text_lower = text.lower()
+    words = text_lower.split()
+    counts = {}
+    for filler in FILLER_WORDS:
+        count = text_lower.count(filler)
+        if count > 0:
+            counts[filler] = count
+    return {'filler_words': counts, 'total_words': len(words)}
+
+
+def reference_detect(text: str) -> Dict[str, int]:
+    """
+    Per-filler word-boundary regex scans; longer fillers claim their words first
+    """
+    remaining = text.lower()
+    counts = {}
+    for filler in sorted(FILLER_WORDS, key=len, reverse=True):
+        pattern = re.compile(r'\b' + r'\s+'.join(map(re.escape, filler.split())) + r'\b')
+        count = len(pattern.findall(remaining))
+        if count > 0:
+            counts[filler] = count
+            remaining = pattern.sub('#', remaining)
+    return counts
+
+
+def best_of(func, *args, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def main() -> None:
+    print(f"{'words':>8} {'scans ms':>10} {'regex ms':>10} {'slowdown':>9} {'old count':>10} {'new count':>10}")
+    for size in SIZES:
+        text = make_transcript(size)
+
+        result = detect_filler_words(text)
+        assert result['filler_words'] == reference_detect(text), size
+        for filler, offsets in result['filler_offsets'].items():
+            assert all(text[start:end].lower().split() == filler.split() for start, end in offsets)
+
+        scans_ms = best_of(legacy_detect, text)
+        regex_ms = best_of(detect_filler_words, text)
+        old_count = sum(legacy_detect(text)['filler_words'].values())
+        print(
+            f"{size:>8} {scans_ms:>10.3f} {regex_ms:>10.3f} {regex_ms / scans_ms:>8.1f}x "
+            f"{old_count:>10} {result['total_filler_count']:>10}"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -2,14 +2,18 @@
 REAL AI Interview Coach Pro - Backend API
 FastAPI application with MediaPipe, OpenCV, and OpenAI integration
 """
-from fastapi import FastAPI, HTTPException, File, UploadFile
+from fastapi import FastAPI, HTTPException, File, UploadFile, Request, Query, Header, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from dotenv import load_dotenv
+import asyncio
+import json
+import math
 import os
+import time
 from datetime import datetime
 import uuid
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import uvicorn
 
 from models.schemas import (
@@ -17,18 +21,30 @@ from models.schemas import (
     TranscribeAudioRequest, TranscribeAudioResponse,
     EvaluateAnswerRequest, EvaluateAnswerResponse,
     AnalyzeFrameRequest, AnalyzeFrameResponse,
-    EndSessionRequest, EndSessionResponse,
+    AnalyzeFramesRequest, AnalyzeFramesResponse, FrameBatchSummary,
+    LiveSessionScores,
+    EndSessionRequest, EndSessionResponse, QuestionMetrics,
     SessionHistoryResponse, SessionSummary,
     EyeContactMetrics, PostureMetrics, GestureMetrics, ExpressionMetrics,
     SessionMetrics
 )
-from services.vision_analyzer import VisionAnalyzer
-from services.speech_analyzer import SpeechAnalyzer
-from services.gemini_speech_analyzer import GeminiSpeechAnalyzer
+from services.vision_workers import VisionWorkerPool, VisionPoolBusy
+from services.vision_engines import PROFILES, DEFAULT_PROFILE
+from services.frame_stream import LatestFrameSlot
+from services.transcription_stream import TranscriptionStream, SegmentTooLarge
+from services.frame_governor import FrameGovernor
+from services.session_metrics import SessionMetricsStore
+from services.analyzer_pool import DEFAULT_SESSION_ID
+from services.transcription_backends import TranscriptionRouter, create_transcription_backend
+from services.audio_analysis import AudioAnalyzer
+from services.transcription_cache import TranscriptionCache
 from services.ai_service import AIService
 from services.gemini_service import GeminiService
 from services.resume_analyzer import ResumeAnalyzer
-from utils.scoring import ConfidenceScorer
+from utils.scoring import (
+    ConfidenceScorer, summarize_frame_batch, detect_filler_words, calculate_speech_pace,
+    analyze_speech_patterns
+)
 
 # Load environment variables
 load_dotenv()
@@ -63,9 +79,130 @@ GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 if not GEMINI_API_KEY:
     print("WARNING: GEMINI_API_KEY not found in environment variables")
 
-vision_analyzer = VisionAnalyzer()
-# Use Gemini for speech analysis (no OpenAI needed!)
-speech_analyzer = GeminiSpeechAnalyzer(GEMINI_API_KEY) if GEMINI_API_KEY else None
+# Landmark engine: "solutions" (legacy mp.solutions graphs), "tasks" (MediaPipe
+# Tasks landmarkers in VIDEO mode, models in VISION_TASKS_MODEL_DIR) or "holistic"
+# (one mp.solutions.holistic pass). VISION_COMPARE_ENGINE runs a second engine
+# on the same frames and reports latency and metric drift in /api/vision/stats.
+VISION_ENGINE = os.getenv("VISION_ENGINE", "solutions")
+VISION_COMPARE_ENGINE = os.getenv("VISION_COMPARE_ENGINE") or None
+
+# Analysis profile (full, balanced, lite): model complexity, iris refinement, max
+# hands and thresholds. Requests may pick another profile per session.
+VISION_PROFILE = os.getenv("VISION_PROFILE", DEFAULT_PROFILE)
+
+
+def vision_engine_options(engine: Optional[str]) -> Dict[str, Any]:
+    if engine == "tasks":
+        return {"model_dir": os.getenv("VISION_TASKS_MODEL_DIR", "mediapipe_models")}
+    return {}
+
+
+# Frame analysis runs off the event loop: VISION_WORKERS=0 uses threads in this
+# process, N > 0 spawns N worker processes that each own their MediaPipe graphs.
+# Every worker keeps one VisionAnalyzer per interview session.
+vision_workers = VisionWorkerPool(
+    workers=int(os.getenv("VISION_WORKERS", 0)),
+    max_pending=int(os.getenv("VISION_MAX_PENDING", 16)),
+    task_timeout=float(os.getenv("VISION_TASK_TIMEOUT", 30)),
+    pool_options={
+        "max_sessions": int(os.getenv("VISION_POOL_MAX_SESSIONS", 8)),
+        "idle_ttl": float(os.getenv("VISION_POOL_IDLE_TTL", 300)),
+        "max_spares": int(os.getenv("VISION_POOL_MAX_SPARES", 2)),
+        "analyzer_options": {
+            "target_long_edge": int(os.getenv("VISION_TARGET_LONG_EDGE", 640)),
+            "min_long_edge": int(os.getenv("VISION_MIN_LONG_EDGE", 320)),
+            "low_res_load": float(os.getenv("VISION_LOW_RES_LOAD", 0.5)),
+            "duplicate_threshold": float(os.getenv("VISION_DUPLICATE_THRESHOLD", 3.0)),
+            "duplicate_max_reuse": int(os.getenv("VISION_DUPLICATE_MAX_REUSE", 15)),
+            "engine": VISION_ENGINE,
+            "engine_options": vision_engine_options(VISION_ENGINE),
+            "compare_engine": VISION_COMPARE_ENGINE,
+            "compare_engine_options": vision_engine_options(VISION_COMPARE_ENGINE),
+            "cascade": os.getenv("VISION_CASCADE", "true").lower() == "true",
+            "profile": VISION_PROFILE,
+            "stage_cadence": {
+                "face": int(os.getenv("VISION_CADENCE_FACE", 1)),
+                "pose": int(os.getenv("VISION_CADENCE_POSE", 3)),
+                "hands": int(os.getenv("VISION_CADENCE_HANDS", 2))
+            }
+        }
+    }
+)
+
+# Transcription backend: gemini (default), whisper (OpenAI Whisper API), local
+# (faster-whisper on the CPU, optional dependency) or stub (deterministic, offline).
+# TRANSCRIPTION_SHORT_CLIP_BACKEND, if set, takes clips up to
+# TRANSCRIPTION_SHORT_CLIP_MAX_BYTES; it falls back to the main backend on errors.
+TRANSCRIPTION_BACKEND = os.getenv("TRANSCRIPTION_BACKEND", "gemini")
+TRANSCRIPTION_SHORT_CLIP_BACKEND = os.getenv("TRANSCRIPTION_SHORT_CLIP_BACKEND") or None
+# Local audio analysis: exact duration, pauses and speaking-time-only pace for
+# every transcribed clip (WAV natively, other formats need ffmpeg on the PATH
+# or at AUDIO_FFMPEG; clips that cannot be decoded keep the backend's timing)
+AUDIO_ANALYSIS = os.getenv("AUDIO_ANALYSIS", "true").lower() == "true"
+# Transcription cache keyed by the clip's SHA-256 and the backend's model:
+# TRANSCRIPTION_CACHE_SIZE entries (0 disables it), each kept for
+# TRANSCRIPTION_CACHE_TTL seconds; TRANSCRIPTION_CACHE_PATH persists it as JSON
+TRANSCRIPTION_CACHE_SIZE = int(os.getenv("TRANSCRIPTION_CACHE_SIZE", 512))
+
+
+def transcription_backend_options(backend: str) -> Optional[Dict[str, Any]]:
+    """
+    Constructor options for a transcription backend (None if its API key is missing)
+    """
+    if backend == "gemini":
+        if not GEMINI_API_KEY:
+            return None
+        # Clips up to GEMINI_INLINE_AUDIO_MAX_BYTES are sent inline; larger ones use the File API
+        return {
+            "api_key": GEMINI_API_KEY,
+            "inline_max_bytes": int(os.getenv("GEMINI_INLINE_AUDIO_MAX_BYTES", 14 * 1024 * 1024)),
+            "upload_timeout": float(os.getenv("GEMINI_UPLOAD_TIMEOUT", 30))
+        }
+    if backend == "whisper":
+        return {"api_key": OPENAI_API_KEY} if OPENAI_API_KEY else None
+    if backend == "local":
+        return {
+            "model": os.getenv("TRANSCRIPTION_LOCAL_MODEL", "base.en"),
+            "compute_type": os.getenv("TRANSCRIPTION_LOCAL_COMPUTE_TYPE", "int8"),
+            "cpu_threads": int(os.getenv("TRANSCRIPTION_LOCAL_CPU_THREADS", 0))
+        }
+    return {}
+
+
+def create_transcriber() -> Optional[TranscriptionRouter]:
+    backends = {}
+    for backend in dict.fromkeys(filter(None, [TRANSCRIPTION_BACKEND, TRANSCRIPTION_SHORT_CLIP_BACKEND])):
+        options = transcription_backend_options(backend)
+        if options is None:
+            print(f"WARNING: transcription backend '{backend}' needs an API key; skipping it")
+            continue
+        try:
+            backends[backend] = create_transcription_backend(backend, **options)
+        except Exception as e:
+            print(f"WARNING: could not start transcription backend '{backend}': {e}")
+    
+    if TRANSCRIPTION_BACKEND not in backends:
+        return None
+    return TranscriptionRouter(
+        backends,
+        default=TRANSCRIPTION_BACKEND,
+        short_clip_backend=TRANSCRIPTION_SHORT_CLIP_BACKEND if TRANSCRIPTION_SHORT_CLIP_BACKEND in backends else None,
+        short_clip_max_bytes=int(os.getenv("TRANSCRIPTION_SHORT_CLIP_MAX_BYTES", 512 * 1024)),
+        audio_analyzer=AudioAnalyzer(
+            min_pause=float(os.getenv("AUDIO_MIN_PAUSE_MS", 500)) / 1000,
+            ffmpeg=os.getenv("AUDIO_FFMPEG", "ffmpeg")
+        ) if AUDIO_ANALYSIS else None,
+        cache=TranscriptionCache(
+            max_entries=TRANSCRIPTION_CACHE_SIZE,
+            ttl=float(os.getenv("TRANSCRIPTION_CACHE_TTL", 86400)),
+            path=os.getenv("TRANSCRIPTION_CACHE_PATH") or None
+        ) if TRANSCRIPTION_CACHE_SIZE > 0 else None
+    )
+
+
+transcriber = create_transcriber()
+# Streamed answers: largest audio segment buffered before it must be closed
+TRANSCRIBE_STREAM_MAX_SEGMENT_BYTES = int(os.getenv("TRANSCRIBE_STREAM_MAX_SEGMENT_BYTES", 20 * 1024 * 1024))
 # Use Gemini for AI service (questions and feedback)
 ai_service = GeminiService(GEMINI_API_KEY) if GEMINI_API_KEY else None
 # Use Gemini for resume analysis
@@ -74,6 +211,36 @@ resume_analyzer = ResumeAnalyzer(GEMINI_API_KEY) if GEMINI_API_KEY else None
 print("✅ Using Gemini for ALL AI features (questions, feedback, transcription, resume analysis)")
 print("✅ No OpenAI API key needed!")
 
+MAX_BATCH_FRAMES = int(os.getenv("VISION_MAX_BATCH_FRAMES", 64))
+
+# Recommends each session's next capture interval from queue load, how much its
+# gaze/posture scores are changing and recent latency, and (when enforcing)
+# answers frames that arrive too early with 429 + Retry-After
+frame_governor = FrameGovernor(
+    base_interval=float(os.getenv("VISION_BASE_INTERVAL_MS", 3000)) / 1000,
+    min_interval=float(os.getenv("VISION_MIN_INTERVAL_MS", 1000)) / 1000,
+    max_interval=float(os.getenv("VISION_MAX_INTERVAL_MS", 6000)) / 1000,
+    tolerance=float(os.getenv("VISION_INTERVAL_TOLERANCE", 0.8)),
+    enforce=os.getenv("VISION_GOVERNOR_ENFORCE", "true").lower() == "true"
+)
+
+
+def check_vision_profile(profile: Optional[str]) -> None:
+    if profile is not None and profile not in PROFILES:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown analysis profile '{profile}' (expected one of {sorted(PROFILES)})"
+        )
+
+
+# Frame metrics for each session, recorded as frames are analyzed and used by
+# /api/session/end (sessions that are never ended expire after the TTL)
+session_metrics_store = SessionMetricsStore(
+    max_sessions=int(os.getenv("SESSION_METRICS_MAX_SESSIONS", 256)),
+    idle_ttl=float(os.getenv("SESSION_METRICS_IDLE_TTL", 3600)),
+    max_frames=int(os.getenv("SESSION_METRICS_MAX_FRAMES", 20000))
+)
+
 # In-memory session storage (replace with database in production)
 sessions_storage: Dict[str, Dict[str, Any]] = {}
 session_history: List[Dict[str, Any]] = []
@@ -92,6 +259,13 @@ async def root():
             "transcribe_audio": "/api/transcribe-audio",
             "evaluate_answer": "/api/evaluate-answer",
             "analyze_frame": "/api/analyze-frame",
+            "analyze_frame_binary": "/api/analyze-frame/binary",
+            "analyze_frames": "/api/analyze-frames",
+            "analyze_stream": "/ws/analyze/{session_id}",
+            "transcribe_stream": "/ws/transcribe/{session_id}",
+            "vision_stats": "/api/vision/stats",
+            "transcription_stats": "/api/transcription/stats",
+            "live_scores": "/api/session/{session_id}/scores",
             "end_session": "/api/session/end",
             "session_history": "/api/sessions/history"
         }
@@ -104,8 +278,9 @@ async def health_check():
     return {
         "status": "healthy",
         "services": {
-            "vision_analyzer": "active (MediaPipe)",
-            "speech_analyzer": "active (Gemini)" if speech_analyzer else "inactive",
+            "vision_analyzer": f"active (MediaPipe {VISION_ENGINE}, {VISION_PROFILE} profile)",
+            "vision_workers": vision_workers.get_stats(),
+            "speech_analyzer": f"active ({transcriber.name})" if transcriber else "inactive",
             "ai_service": "active (Gemini)" if ai_service else "inactive",
             "resume_analyzer": "active (Gemini)" if resume_analyzer else "inactive"
         },
@@ -115,6 +290,32 @@ async def health_check():
     }
 
 
+@app.get("/api/vision/stats")
+async def vision_stats():
+    """
+    Vision pipeline instrumentation: worker queues, analyzer pools and per-frame counters
+    """
+    try:
+        return {
+            "workers": vision_workers.get_stats(),
+            "governor": frame_governor.get_stats(),
+            "session_metrics": session_metrics_store.get_stats(),
+            **await vision_workers.get_analyzer_stats()
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error collecting vision stats: {str(e)}")
+
+
+@app.get("/api/transcription/stats")
+async def transcription_stats():
+    """
+    Transcription routing and per-backend latency
+    """
+    if not transcriber:
+        raise HTTPException(status_code=503, detail="Speech analyzer not available")
+    return transcriber.get_stats()
+
+
 @app.post("/api/analyze-resume")
 async def analyze_resume(resume: UploadFile = File(...)):
     """
@@ -224,16 +425,16 @@ async def generate_question(request: GenerateQuestionRequest):
 @app.post("/api/transcribe-audio", response_model=TranscribeAudioResponse)
 async def transcribe_audio(request: TranscribeAudioRequest):
     """
-    Transcribe audio using OpenAI Whisper API
+    Transcribe audio with the configured transcription backend
     """
-    if not speech_analyzer:
+    if not transcriber:
         raise HTTPException(
             status_code=503,
-            detail="Speech analyzer not available. Please configure OPENAI_API_KEY."
+            detail="Speech analyzer not available. Please configure TRANSCRIPTION_BACKEND and its API key."
         )
     
     try:
-        result = speech_analyzer.transcribe_audio(
+        result = await transcriber.transcribe_audio(
             audio_base64=request.audio_base64,
             audio_format=request.format
         )
@@ -241,11 +442,16 @@ async def transcribe_audio(request: TranscribeAudioRequest):
         if 'error' in result:
             raise HTTPException(status_code=500, detail=result['error'])
         
+        if request.session_id:
+            session_metrics_store.add_transcription(request.session_id, result)
+        
         return TranscribeAudioResponse(
             text=result['text'],
             duration=result['duration'],
             word_count=result['word_count'],
-            words_per_minute=result['words_per_minute']
+            words_per_minute=result['words_per_minute'],
+            speaking_duration=result.get('speaking_duration'),
+            pauses_count=result.get('pauses_count')
         )
     
     except HTTPException:
@@ -278,74 +484,435 @@ async def evaluate_answer(request: EvaluateAnswerRequest):
         raise HTTPException(status_code=500, detail=f"Error evaluating answer: {str(e)}")
 
 
+def build_frame_response(
+    result: Dict[str, Any],
+    recommended_interval_ms: Optional[int] = None
+) -> AnalyzeFrameResponse:
+    """
+    Convert a VisionAnalyzer result dict into the API response model
+    """
+    return AnalyzeFrameResponse(
+        eye_contact=EyeContactMetrics(**result['eye_contact']),
+        posture=PostureMetrics(**result['posture']),
+        gestures=GestureMetrics(**result['gestures']),
+        expressions=ExpressionMetrics(**result['expressions']),
+        overall_confidence=result['overall_confidence'],
+        timestamp=result['timestamp'],
+        analysis_scale=result.get('analysis_scale', 1.0),
+        recommended_interval_ms=recommended_interval_ms
+    )
+
+
+def check_frame_rate(session_id: Optional[str]) -> None:
+    """
+    Reject a frame that arrives faster than the session's recommended rate
+    """
+    if session_id is None:
+        # Anonymous clients share one analyzer; don't let them throttle each other
+        return
+    retry_after = frame_governor.admit(session_id)
+    if retry_after is not None:
+        raise HTTPException(
+            status_code=429,
+            detail=f"Frame sent too soon; retry in {int(retry_after * 1000)} ms",
+            headers={"Retry-After": str(math.ceil(retry_after))}
+        )
+
+
+async def analyze_governed_frame(
+    session_id: Optional[str],
+    method: str,
+    frame: Any,
+    timestamp: float,
+    profile: Optional[str]
+) -> AnalyzeFrameResponse:
+    """
+    Analyze one frame and attach the session's recommended next-capture interval
+    """
+    load = vision_workers.load(session_id)
+    started = time.monotonic()
+    result = await vision_workers.run(session_id, method, frame, timestamp, load, profile=profile)
+    
+    governed_session = session_id or DEFAULT_SESSION_ID
+    frame_governor.record(governed_session, result, time.monotonic() - started, load)
+    if session_id is not None:
+        session_metrics_store.append(session_id, result)
+    return build_frame_response(result, frame_governor.recommended_interval_ms(governed_session))
+
+
 @app.post("/api/analyze-frame", response_model=AnalyzeFrameResponse)
 async def analyze_frame(request: AnalyzeFrameRequest):
     """
     Analyze a video frame for eye contact, posture, gestures, and expressions
     """
+    check_vision_profile(request.profile)
+    check_frame_rate(request.session_id)
     try:
-        result = vision_analyzer.analyze_frame(
-            frame_base64=request.frame_base64,
-            timestamp=request.timestamp
+        return await analyze_governed_frame(
+            request.session_id,
+            'analyze_frame',
+            request.frame_base64,
+            request.timestamp,
+            request.profile
         )
-        
-        return AnalyzeFrameResponse(
-            eye_contact=EyeContactMetrics(**result['eye_contact']),
-            posture=PostureMetrics(**result['posture']),
-            gestures=GestureMetrics(**result['gestures']),
-            expressions=ExpressionMetrics(**result['expressions']),
-            overall_confidence=result['overall_confidence'],
-            timestamp=result['timestamp']
+    
+    except VisionPoolBusy as e:
+        raise HTTPException(status_code=503, detail=f"Frame analysis busy: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error analyzing frame: {str(e)}")
+
+
+@app.post("/api/analyze-frame/binary", response_model=AnalyzeFrameResponse)
+async def analyze_frame_binary(
+    request: Request,
+    timestamp: Optional[float] = Query(None),
+    session_id: Optional[str] = Query(None),
+    profile: Optional[str] = Query(None),
+    x_frame_timestamp: Optional[float] = Header(None),
+    x_session_id: Optional[str] = Header(None),
+    x_vision_profile: Optional[str] = Header(None)
+):
+    """
+    Analyze a video frame sent as a raw image body (e.g. image/jpeg) or as a
+    multipart upload in a `frame` field. Timestamp, session and profile come
+    from query parameters or the X-Frame-Timestamp / X-Session-Id /
+    X-Vision-Profile headers.
+    """
+    timestamp = timestamp if timestamp is not None else x_frame_timestamp
+    session_id = session_id or x_session_id
+    profile = profile or x_vision_profile
+    if timestamp is None:
+        raise HTTPException(status_code=422, detail="timestamp query parameter or X-Frame-Timestamp header is required")
+    check_vision_profile(profile)
+    
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("multipart/form-data"):
+        try:
+            form = await request.form()
+        except Exception as e:
+            raise HTTPException(status_code=422, detail=f"Malformed multipart upload: {str(e)}")
+        upload = form.get("frame")
+        if upload is None or isinstance(upload, str):
+            raise HTTPException(status_code=422, detail="multipart upload must include a 'frame' file field")
+        frame_bytes = await upload.read()
+    else:
+        frame_bytes = await request.body()
+    
+    if not frame_bytes:
+        raise HTTPException(status_code=422, detail="Empty frame body")
+    
+    # Only a well-formed request takes the session's frame slot
+    check_frame_rate(session_id)
+    
+    try:
+        return await analyze_governed_frame(
+            session_id,
+            'analyze_frame_bytes',
+            frame_bytes,
+            timestamp,
+            profile
         )
     
+    except VisionPoolBusy as e:
+        raise HTTPException(status_code=503, detail=f"Frame analysis busy: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error analyzing frame: {str(e)}")
 
 
-@app.post("/api/session/end", response_model=EndSessionResponse)
-async def end_session(request: EndSessionRequest):
+@app.post("/api/analyze-frames", response_model=AnalyzeFramesResponse)
+async def analyze_frames(request: AnalyzeFramesRequest):
     """
-    End a session and generate comprehensive report
+    Analyze a buffered batch of frames from one session in timestamp order
     """
+    if not request.frames:
+        raise HTTPException(status_code=422, detail="Batch must contain at least one frame")
+    if len(request.frames) > MAX_BATCH_FRAMES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {len(request.frames)} frames (max {MAX_BATCH_FRAMES})"
+        )
+    check_vision_profile(request.profile)
+    
     try:
-        # Aggregate frame metrics
-        aggregated_metrics = ConfidenceScorer.aggregate_session_metrics(
-            request.frame_metrics
+        results = await vision_workers.run(
+            request.session_id,
+            'analyze_frames',
+            [(frame.frame_base64, frame.timestamp) for frame in request.frames],
+            vision_workers.load(request.session_id),
+            profile=request.profile
         )
+        if request.session_id is not None:
+            session_metrics_store.extend(request.session_id, results)
         
-        # Analyze speech patterns
-        speech_metrics = {
+        return AnalyzeFramesResponse(
+            results=[build_frame_response(result) for result in results],
+            summary=FrameBatchSummary(**summarize_frame_batch(results))
+        )
+    
+    except VisionPoolBusy as e:
+        raise HTTPException(status_code=503, detail=f"Frame analysis busy: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error analyzing frames: {str(e)}")
+
+
+@app.websocket("/ws/analyze/{session_id}")
+async def analyze_stream(websocket: WebSocket, session_id: str):
+    """
+    Stream video frames over a WebSocket and receive analysis results
+    
+    Send each frame as a binary message (encoded JPEG). To attach a timestamp,
+    send a text message `{"timestamp": 12.5}` just before the frame; otherwise
+    seconds since the socket opened are used. Each analyzed frame is answered
+    with an AnalyzeFrameResponse-shaped JSON message. If frames arrive faster
+    than they can be analyzed, only the newest waiting frame is kept. An
+    analysis profile can be chosen with the `profile` query parameter.
+    """
+    await websocket.accept()
+    profile = websocket.query_params.get("profile")
+    if profile is not None and profile not in PROFILES:
+        await websocket.send_json({"error": f"Unknown analysis profile '{profile}' (expected one of {sorted(PROFILES)})"})
+        await websocket.close(code=1008)
+        return
+    opened_at = time.monotonic()
+    slot = LatestFrameSlot()
+    
+    async def analyze_latest():
+        while True:
+            frame_bytes, timestamp = await slot.get()
+            try:
+                response = await analyze_governed_frame(
+                    session_id,
+                    'analyze_frame_bytes',
+                    frame_bytes,
+                    timestamp,
+                    profile
+                )
+                await websocket.send_json(response.model_dump())
+            except VisionPoolBusy as e:
+                await websocket.send_json({"error": f"Frame analysis busy: {str(e)}", "timestamp": timestamp})
+            except Exception as e:
+                await websocket.send_json({"error": f"Error analyzing frame: {str(e)}", "timestamp": timestamp})
+    
+    analysis_task = asyncio.create_task(analyze_latest())
+    next_timestamp = None
+    
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            
+            if message.get("bytes"):
+                timestamp = next_timestamp if next_timestamp is not None else time.monotonic() - opened_at
+                next_timestamp = None
+                slot.put(message["bytes"], timestamp)
+            elif message.get("text"):
+                try:
+                    next_timestamp = float(json.loads(message["text"])["timestamp"])
+                except (ValueError, KeyError, TypeError):
+                    await websocket.send_json({"error": 'Text messages must be {"timestamp": <seconds>}'})
+    finally:
+        analysis_task.cancel()
+        # Collect the task's outcome: a send to a client that already left raises
+        # in the task, and that exception would otherwise go unretrieved
+        await asyncio.gather(analysis_task, return_exceptions=True)
+        print(f"Frame stream closed for {session_id}: {slot.received} received, {slot.dropped} dropped as stale")
+
+
+@app.websocket("/ws/transcribe/{session_id}")
+async def transcribe_stream(websocket: WebSocket, session_id: str):
+    """
+    Stream an answer's audio while recording and receive partial transcripts
+    
+    Send audio as binary messages and `{"type": "segment"}` after each
+    self-contained clip (e.g. each MediaRecorder start/stop); completed
+    segments are transcribed in the background, in order, and answered with
+    `{"type": "partial", ...}` messages carrying the text and filler/pace stats
+    so far. `{"type": "end"}` closes the last segment; the reply is
+    `{"type": "final", ...}` with the TranscribeAudioResponse fields, after
+    which the socket is closed; the answer's timing is kept for the session
+    report like `/api/transcribe-audio` with a `session_id`. The audio format comes from the `format` query
+    parameter (default webm).
+    """
+    await websocket.accept()
+    if not transcriber:
+        await websocket.send_json({"error": "Speech analyzer not available. Please configure TRANSCRIPTION_BACKEND and its API key."})
+        await websocket.close(code=1011)
+        return
+    
+    stream = TranscriptionStream(
+        transcriber.transcribe_audio_bytes,
+        websocket.send_json,
+        audio_format=websocket.query_params.get("format", "webm"),
+        max_segment_bytes=TRANSCRIBE_STREAM_MAX_SEGMENT_BYTES
+    )
+    
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            
+            if message.get("bytes"):
+                try:
+                    stream.add_chunk(message["bytes"])
+                except SegmentTooLarge as e:
+                    await websocket.send_json({"error": str(e)})
+                    await websocket.close(code=1009)
+                    break
+                continue
+            
+            try:
+                kind = json.loads(message.get("text") or "")["type"]
+            except (ValueError, KeyError, TypeError):
+                kind = None
+            
+            if kind == "segment":
+                stream.end_segment()
+            elif kind == "end":
+                try:
+                    result = await stream.finish()
+                except Exception as e:
+                    print(f"Error finishing transcription stream for {session_id}: {e}")
+                    await websocket.send_json({"type": "error", "error": f"Error transcribing audio: {str(e)}"})
+                    await websocket.close(code=1011)
+                    break
+                if stream.segments_transcribed:
+                    session_metrics_store.add_transcription(session_id, result)
+                final = TranscribeAudioResponse(
+                    text=result['text'],
+                    duration=result['duration'],
+                    word_count=result['word_count'],
+                    words_per_minute=result['words_per_minute'],
+                    speaking_duration=result['speaking_duration'],
+                    pauses_count=result['pauses_count']
+                )
+                await websocket.send_json({
+                    "type": "final",
+                    **final.model_dump(),
+                    "filler_words": result['filler_words'],
+                    "filler_offsets": result['filler_offsets'],
+                    "total_filler_count": result['total_filler_count'],
+                    "filler_percentage": result['filler_percentage'],
+                    "segments": stream.segments_transcribed,
+                    "failed_segments": stream.segments_failed
+                })
+                await websocket.close()
+                break
+            else:
+                await websocket.send_json({"error": 'Text messages must be {"type": "segment"} or {"type": "end"}'})
+    finally:
+        stream.cancel()
+        print(
+            f"Transcription stream closed for {session_id}: {stream.segments_queued} segments queued, "
+            f"{stream.segments_transcribed} transcribed, {stream.segments_failed} failed"
+        )
+
+
+@app.get("/api/session/{session_id}/scores", response_model=LiveSessionScores)
+async def live_session_scores(session_id: str):
+    """
+    Running scores for a session that is still in progress
+    
+    Kept up to date frame by frame as the session's frames are analyzed, so
+    this is O(1) regardless of session length.
+    """
+    scores = session_metrics_store.scores(session_id)
+    if scores is None:
+        raise HTTPException(status_code=404, detail=f"No frames recorded for session {session_id}")
+    
+    metrics = scores.aggregate()
+    return LiveSessionScores(
+        session_id=session_id,
+        frames_analyzed=scores.frames,
+        eye_contact_percentage=metrics['eye_contact_percentage'],
+        posture_score=metrics['posture_score'],
+        expression_confidence=metrics['expression_confidence'],
+        gesture_score=metrics['gesture_score'],
+        overall_confidence=ConfidenceScorer.calculate_overall_confidence(
+            eye_contact_score=metrics['eye_contact_percentage'],
+            posture_score=metrics['posture_score'],
+            speech_clarity_score=75.0,
+            gesture_score=metrics['gesture_score'],
+            expression_score=metrics['expression_confidence']
+        ),
+        variability=scores.variability()
+    )
+
+
+def transcription_speech_metrics(
+    transcriptions: List[str],
+    recorded: Optional[Dict[str, Dict[str, Any]]] = None
+) -> Dict[str, Any]:
+    """
+    Speech metrics for already-transcribed answers (neutral defaults without any)
+    
+    Answers found in `recorded` (the session's transcription results, keyed by
+    text) use their measured timing; the rest are timed at an assumed 150 WPM.
+    """
+    if not transcriptions:
+        return {
             'speech_clarity_score': 75.0,
             'filler_word_count': 0,
-            'speech_pace': 140.0
+            'speech_pace': 140.0,
+            'pauses_count': 0
         }
+    
+    transcription_results = []
+    for text in transcriptions:
+        if recorded and text in recorded:
+            transcription_results.append(recorded[text])
+            continue
         
-        if speech_analyzer and request.transcriptions:
-            transcription_results = []
-            for text in request.transcriptions:
-                # Simple analysis without re-transcribing
-                words = text.split()
-                word_count = len(words)
-                # Estimate duration based on average speaking pace
-                estimated_duration = word_count / 2.5  # ~150 WPM
-                
-                from utils.scoring import detect_filler_words, calculate_speech_pace
-                filler_analysis = detect_filler_words(text)
-                wpm = calculate_speech_pace(word_count, estimated_duration)
-                
-                transcription_results.append({
-                    'word_count': word_count,
-                    'duration': estimated_duration,
-                    'total_filler_count': filler_analysis['total_filler_count'],
-                    'words_per_minute': wpm
-                })
-            
-            speech_analysis = speech_analyzer.analyze_speech_patterns(transcription_results)
-            speech_metrics = {
-                'speech_clarity_score': speech_analysis['clarity_score'],
-                'filler_word_count': speech_analysis['total_filler_count'],
-                'speech_pace': speech_analysis['average_wpm']
-            }
+        # Simple analysis without re-transcribing
+        filler_analysis = detect_filler_words(text)
+        word_count = filler_analysis['total_words']
+        # Estimate duration based on average speaking pace
+        estimated_duration = word_count / 2.5  # ~150 WPM
+        
+        wpm = calculate_speech_pace(word_count, estimated_duration)
+        
+        transcription_results.append({
+            'word_count': word_count,
+            'duration': estimated_duration,
+            'total_filler_count': filler_analysis['total_filler_count'],
+            'words_per_minute': wpm
+        })
+    
+    speech_analysis = analyze_speech_patterns(transcription_results)
+    return {
+        'speech_clarity_score': speech_analysis['clarity_score'],
+        'filler_word_count': speech_analysis['total_filler_count'],
+        'speech_pace': speech_analysis['average_wpm'],
+        'pauses_count': speech_analysis['total_pauses']
+    }
+
+
+@app.post("/api/session/end", response_model=EndSessionResponse)
+async def end_session(request: EndSessionRequest):
+    """
+    End a session and generate comprehensive report
+    
+    Frame metrics come from the server-side running scores kept while the
+    session's frames were analyzed (every frame counts, even past the column
+    store's thinning); `frame_metrics` in the request is only used by clients
+    that still upload them. With `question_segments`, the recorded frames are
+    also bucketed by timestamp into a per-question breakdown.
+    """
+    try:
+        # Aggregate frame metrics
+        if request.frame_metrics is not None:
+            aggregated_metrics = ConfidenceScorer.aggregate_session_metrics(request.frame_metrics)
+        else:
+            scores = session_metrics_store.scores(request.session_id)
+            aggregated_metrics = (
+                scores.aggregate() if scores is not None
+                else ConfidenceScorer.aggregate_session_metrics([])
+            )
+        
+        # Analyze speech patterns (with the timings of answers transcribed for this session)
+        recorded_transcriptions = session_metrics_store.transcriptions(request.session_id)
+        speech_metrics = transcription_speech_metrics(request.transcriptions, recorded_transcriptions)
         
         # Combine all metrics
         all_metrics = {**aggregated_metrics, **speech_metrics}
@@ -400,6 +967,7 @@ async def end_session(request: EndSessionRequest):
             speech_clarity_score=all_metrics['speech_clarity_score'],
             filler_word_count=all_metrics['filler_word_count'],
             speech_pace=all_metrics['speech_pace'],
+            pauses_count=all_metrics['pauses_count'],
             overall_confidence=overall_confidence
         )
         
@@ -418,6 +986,43 @@ async def end_session(request: EndSessionRequest):
         }
         session_history.append(session_summary)
         
+        # Per-question breakdown from the session's recorded frames
+        question_breakdown = []
+        if request.question_segments:
+            segment_metrics = ConfidenceScorer.segment_frame_columns(
+                session_metrics_store.columns(request.session_id),
+                [(segment.start_time, segment.end_time) for segment in request.question_segments]
+            )
+            for index, (segment, frame_metrics) in enumerate(zip(request.question_segments, segment_metrics)):
+                question_speech = transcription_speech_metrics(
+                    [segment.transcription] if segment.transcription else [],
+                    recorded_transcriptions
+                )
+                question_breakdown.append(QuestionMetrics(
+                    question_index=index,
+                    question=segment.question,
+                    start_time=segment.start_time,
+                    end_time=segment.end_time,
+                    frames_analyzed=frame_metrics['frames_analyzed'],
+                    eye_contact_percentage=frame_metrics['eye_contact_percentage'],
+                    posture_score=frame_metrics['posture_score'],
+                    expression_confidence=frame_metrics['expression_confidence'],
+                    gesture_score=frame_metrics['gesture_score'],
+                    **question_speech,
+                    overall_confidence=ConfidenceScorer.calculate_overall_confidence(
+                        eye_contact_score=frame_metrics['eye_contact_percentage'],
+                        posture_score=frame_metrics['posture_score'],
+                        speech_clarity_score=question_speech['speech_clarity_score'],
+                        gesture_score=frame_metrics['gesture_score'],
+                        expression_score=frame_metrics['expression_confidence']
+                    )
+                ))
+        
+        # Hand the session's vision analyzer back to the pool
+        await vision_workers.release(request.session_id)
+        frame_governor.forget(request.session_id)
+        session_metrics_store.discard(request.session_id)
+        
         # Create response
         response = EndSessionResponse(
             session_id=request.session_id,
@@ -427,7 +1032,8 @@ async def end_session(request: EndSessionRequest):
             detailed_feedback=ai_feedback['detailed_feedback'],
             strengths=ai_feedback['strengths'],
             areas_for_improvement=ai_feedback['areas_for_improvement'],
-            recommendations=ai_feedback['recommendations']
+            recommendations=ai_feedback['recommendations'],
+            question_breakdown=question_breakdown
         )
         
         return response
@@ -489,10 +1095,18 @@ async def get_session_history():
         raise HTTPException(status_code=500, detail=f"Error fetching session history: {str(e)}")
 
 
+@app.on_event("startup")
+async def startup_event():
+    """Start background workers"""
+    vision_workers.start()
+
+
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
-    vision_analyzer.cleanup()
+    await vision_workers.shutdown()
+    if transcriber and transcriber.cache is not None:
+        transcriber.cache.flush()
 
 
 if __name__ == "__main__":
@@ -38,6 +38,7 @@ class GenerateQuestionResponse(BaseModel):
 class TranscribeAudioRequest(BaseModel):
     audio_base64: str
     format: str = "webm"
+    session_id: Optional[str] = None  # Keep the result's timing for the session report
 
 
 class TranscribeAudioResponse(BaseModel):
@@ -45,6 +46,8 @@ class TranscribeAudioResponse(BaseModel):
     duration: float
     word_count: int
     words_per_minute: float
+    speaking_duration: Optional[float] = None  # Set when the audio was analyzed locally
+    pauses_count: Optional[int] = None
 
 
 class EvaluateAnswerRequest(BaseModel):
@@ -66,6 +69,8 @@ class EvaluateAnswerResponse(BaseModel):
 class AnalyzeFrameRequest(BaseModel):
     frame_base64: str
     timestamp: float
+    session_id: Optional[str] = None  # Keeps tracking state separate per interview
+    profile: Optional[str] = None  # Analysis profile: full, balanced or lite (default: server setting)
 
 
 class EyeContactMetrics(BaseModel):
@@ -102,6 +107,50 @@ class AnalyzeFrameResponse(BaseModel):
     expressions: ExpressionMetrics
     overall_confidence: float  # 0-100
     timestamp: float
+    analysis_scale: float = 1.0  # Resolution analyzed, relative to the uploaded frame
+    recommended_interval_ms: Optional[int] = None  # When to send the next frame for this session
+
+
+class FrameInput(BaseModel):
+    frame_base64: str
+    timestamp: float
+
+
+class AnalyzeFramesRequest(BaseModel):
+    session_id: Optional[str] = None
+    frames: List[FrameInput]
+    profile: Optional[str] = None
+
+
+class FrameBatchSummary(BaseModel):
+    frames_analyzed: int
+    start_timestamp: float
+    end_timestamp: float
+    eye_contact_ratio: float  # 0-1, share of frames looking at camera
+    average_gaze_score: float
+    average_posture_score: float
+    slouch_ratio: float
+    average_fidgeting_score: float
+    hand_detected_ratio: float
+    average_confidence_level: float
+    average_engagement_score: float
+    average_overall_confidence: float  # 0-100
+
+
+class AnalyzeFramesResponse(BaseModel):
+    results: List[AnalyzeFrameResponse]  # Ordered by timestamp
+    summary: FrameBatchSummary
+
+
+class LiveSessionScores(BaseModel):
+    session_id: str
+    frames_analyzed: int
+    eye_contact_percentage: float
+    posture_score: float
+    expression_confidence: float
+    gesture_score: float
+    overall_confidence: float  # 0-100, with the default speech clarity until the session ends
+    variability: Dict[str, float]  # Std dev of the per-frame 0-1 scores so far
 
 
 class FillerWord(BaseModel):
@@ -127,16 +176,42 @@ class SessionMetrics(BaseModel):
     speech_clarity_score: float
     filler_word_count: int
     speech_pace: float
+    pauses_count: int = 0
     overall_confidence: float
 
 
+class QuestionSegment(BaseModel):
+    question: Optional[str] = None
+    start_time: float  # Same clock as frame timestamps (seconds into the session)
+    end_time: float
+    transcription: Optional[str] = None
+
+
 class EndSessionRequest(BaseModel):
     session_id: str
     total_duration: float
     frames_analyzed: int
     questions_answered: int
     transcriptions: List[str]
-    frame_metrics: List[Dict[str, Any]]
+    question_segments: Optional[List[QuestionSegment]] = None
+    frame_metrics: Optional[List[Dict[str, Any]]] = None  # Legacy: the server records frames itself
+
+
+class QuestionMetrics(BaseModel):
+    question_index: int
+    question: Optional[str] = None
+    start_time: float
+    end_time: float
+    frames_analyzed: int
+    eye_contact_percentage: float
+    posture_score: float
+    expression_confidence: float
+    gesture_score: float
+    speech_clarity_score: float
+    filler_word_count: int
+    speech_pace: float
+    pauses_count: int = 0
+    overall_confidence: float
 
 
 class EndSessionResponse(BaseModel):
@@ -148,6 +223,7 @@ class EndSessionResponse(BaseModel):
     strengths: List[str]
     areas_for_improvement: List[str]
     recommendations: List[str]
+    question_breakdown: List[QuestionMetrics] = []  # One entry per question segment sent
 
 
 class SessionSummary(BaseModel):
@@ -0,0 +1,281 @@
+"""
+Per-session VisionAnalyzer pool
+Gives every interview session its own tracking state while reusing warmed MediaPipe graphs
+"""
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Any, Iterator, List, Optional
+
+from services.vision_analyzer import VisionAnalyzer
+from services.vision_engines import DEFAULT_PROFILE
+
+
+DEFAULT_SESSION_ID = "default"
+
+
+def merge_counters(counters: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Sum numeric counters key by key
+    """
+    merged: Dict[str, Any] = {}
+    for entry in counters:
+        for key, value in entry.items():
+            merged[key] = merged.get(key, 0) + value
+    return merged
+
+
+class VisionAnalyzerPool:
+    """
+    Bounded pool of VisionAnalyzer instances keyed by session ID
+
+    Active analyzers are kept in LRU order. When the pool is full, or an analyzer
+    has been idle longer than the TTL, it is evicted: its tracking state is reset
+    and it is parked as a warm spare for the next new session. Spares beyond
+    `max_spares` are released with `cleanup()`.
+    
+    Every `acquire` must be paired with a `checkin` (or use `checkout`). An
+    analyzer evicted while checked out keeps its state until its last checkin;
+    only then is it reset and parked, so a frame in progress is never reset,
+    closed or handed to another session under it.
+    
+    Analyzers are built for one analysis profile; a session that asks for a
+    different profile gets an analyzer (new or spare) built for that profile.
+    A request without a profile keeps the session's current analyzer; only a
+    new session falls back to the pool's default profile.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 8,
+        idle_ttl: float = 300.0,
+        max_spares: int = 2,
+        analyzer_factory: Callable[..., VisionAnalyzer] = VisionAnalyzer,
+        analyzer_options: Optional[Dict[str, Any]] = None
+    ):
+        self.max_sessions = max(1, max_sessions)
+        self.idle_ttl = idle_ttl
+        self.max_spares = max(0, max_spares)
+        self.analyzer_factory = analyzer_factory
+        self.analyzer_options = analyzer_options or {}
+        self.default_profile = self.analyzer_options.get('profile', DEFAULT_PROFILE)
+
+        self._active: "OrderedDict[str, VisionAnalyzer]" = OrderedDict()
+        self._last_used: Dict[str, float] = {}
+        self._spares: List[VisionAnalyzer] = []
+        self._to_close: List[VisionAnalyzer] = []
+        # id(analyzer) -> outstanding checkouts, and analyzers evicted while checked out
+        self._checkouts: Dict[int, int] = {}
+        self._retiring: Dict[int, VisionAnalyzer] = {}
+        self._lock = threading.Lock()
+
+        # Counters
+        self.created = 0
+        self.reused = 0
+        self.evicted = 0
+        self._retired_counters: Dict[str, int] = {}
+
+    def acquire(self, session_id: Optional[str] = None, profile: Optional[str] = None) -> VisionAnalyzer:
+        """
+        Check out the analyzer for a session, creating or recycling one if needed
+
+        Args:
+            session_id: Interview session identifier (falls back to a shared default)
+            profile: Analysis profile for the session (None keeps the session's
+                current profile, or uses the pool's default for a new session)
+
+        Returns:
+            VisionAnalyzer owned by this session (hand it back with `checkin`)
+        """
+        session_id = session_id or DEFAULT_SESSION_ID
+
+        with self._lock:
+            analyzer = self._checkout(session_id, profile)
+
+        if analyzer is None:
+            # Build new graphs outside the pool lock; this takes a while
+            fresh = self.analyzer_factory(**{
+                **self.analyzer_options,
+                'profile': profile or self.default_profile
+            })
+            with self._lock:
+                self.created += 1
+                analyzer = self._checkout(session_id, profile, fresh)
+
+        self._close_pending()
+        return analyzer
+
+    def checkin(self, analyzer: VisionAnalyzer) -> None:
+        """
+        Hand back an analyzer from `acquire`; parks it if it was evicted meanwhile
+        """
+        with self._lock:
+            key = id(analyzer)
+            count = self._checkouts.get(key, 0) - 1
+            if count > 0:
+                self._checkouts[key] = count
+            else:
+                self._checkouts.pop(key, None)
+                if self._retiring.pop(key, None) is not None:
+                    self._park(analyzer)
+        self._close_pending()
+
+    @contextmanager
+    def checkout(self, session_id: Optional[str] = None, profile: Optional[str] = None) -> Iterator[VisionAnalyzer]:
+        """
+        `acquire` for the duration of a with-block
+        """
+        analyzer = self.acquire(session_id, profile)
+        try:
+            yield analyzer
+        finally:
+            self.checkin(analyzer)
+
+    def release(self, session_id: Optional[str]) -> None:
+        """
+        Return a session's analyzer to the pool (e.g. when the interview ends)
+        """
+        with self._lock:
+            self._evict(session_id or DEFAULT_SESSION_ID)
+        self._close_pending()
+
+    def evict_idle(self) -> int:
+        """
+        Evict analyzers idle longer than the TTL
+
+        Returns:
+            Number of sessions evicted
+        """
+        with self._lock:
+            evicted = self._evict_idle(time.monotonic())
+        self._close_pending()
+        return evicted
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Pool occupancy and lifecycle counters
+        """
+        with self._lock:
+            analyzer_counters = merge_counters(
+                [self._retired_counters] +
+                [analyzer.get_stats() for analyzer in self._active.values()] +
+                [analyzer.get_stats() for analyzer in self._spares] +
+                [analyzer.get_stats() for analyzer in self._retiring.values()]
+            )
+            return {
+                'active_sessions': len(self._active),
+                'spare_analyzers': len(self._spares),
+                'max_sessions': self.max_sessions,
+                'created': self.created,
+                'reused': self.reused,
+                'evicted': self.evicted,
+                'checked_out': sum(self._checkouts.values()),
+                'analyzers': analyzer_counters
+            }
+
+    def cleanup(self) -> None:
+        """
+        Release every analyzer held by the pool
+        """
+        with self._lock:
+            self._to_close.extend(self._active.values())
+            self._to_close.extend(self._spares)
+            self._to_close.extend(self._retiring.values())
+            self._active.clear()
+            self._retiring.clear()
+            self._last_used.clear()
+            self._spares = []
+        self._close_pending()
+
+    def _checkout(
+        self,
+        session_id: str,
+        profile: Optional[str],
+        fresh: Optional[VisionAnalyzer] = None
+    ) -> Optional[VisionAnalyzer]:
+        """
+        Look up or assign the analyzer for a session. Must be called with the lock held.
+
+        Returns:
+            The session's analyzer, or None if a new one has to be built
+        """
+        now = time.monotonic()
+        self._evict_idle(now)
+
+        analyzer = self._active.get(session_id)
+        if analyzer is not None and profile is not None and analyzer.profile != profile:
+            # The session switched profiles: its analyzer can serve someone else
+            self._evict(session_id)
+            analyzer = None
+        if analyzer is not None:
+            if fresh is not None:
+                # Another request built one for this session first
+                self._park(fresh)
+            self._active.move_to_end(session_id)
+            self._last_used[session_id] = now
+            self._checkouts[id(analyzer)] = self._checkouts.get(id(analyzer), 0) + 1
+            return analyzer
+
+        profile = profile or self.default_profile
+        if fresh is None:
+            for index in range(len(self._spares) - 1, -1, -1):
+                if self._spares[index].profile == profile:
+                    fresh = self._spares.pop(index)
+                    self.reused += 1
+                    break
+        if fresh is None:
+            return None
+
+        # Make room for the new session by evicting the least recently used one
+        while len(self._active) >= self.max_sessions:
+            self._evict(next(iter(self._active)))
+
+        self._active[session_id] = fresh
+        self._last_used[session_id] = now
+        self._checkouts[id(fresh)] = self._checkouts.get(id(fresh), 0) + 1
+        return fresh
+
+    def _evict_idle(self, now: float) -> int:
+        if self.idle_ttl <= 0:
+            return 0
+        idle = [
+            session_id for session_id, last_used in self._last_used.items()
+            if now - last_used > self.idle_ttl
+        ]
+        for session_id in idle:
+            self._evict(session_id)
+        return len(idle)
+
+    def _evict(self, session_id: str) -> None:
+        analyzer = self._active.pop(session_id, None)
+        self._last_used.pop(session_id, None)
+        if analyzer is not None:
+            self.evicted += 1
+            if id(analyzer) in self._checkouts:
+                # Still analyzing a frame: parked by the last checkin instead
+                self._retiring[id(analyzer)] = analyzer
+            else:
+                self._park(analyzer)
+
+    def _park(self, analyzer: VisionAnalyzer) -> None:
+        """
+        Keep an analyzer as a warm spare, or schedule it for cleanup if we have enough
+        """
+        analyzer.reset()
+        if len(self._spares) < self.max_spares:
+            self._spares.append(analyzer)
+        else:
+            self._to_close.append(analyzer)
+
+    def _close_pending(self) -> None:
+        # MediaPipe graph teardown happens outside the pool lock
+        with self._lock:
+            to_close, self._to_close = self._to_close, []
+        for analyzer in to_close:
+            with self._lock:
+                self._retired_counters = merge_counters([self._retired_counters, analyzer.get_stats()])
+            try:
+                analyzer.cleanup()
+            except Exception as e:
+                print(f"Error cleaning up vision analyzer: {e}")
@@ -0,0 +1,179 @@
+"""
+Local audio signal analysis
+Decodes an answer clip once to mono PCM and measures its exact duration,
+speaking time and pauses with frame-energy voice activity detection
+"""
+import io
+import subprocess
+import wave
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+
+class AudioDecodeError(Exception):
+    """
+    Raised when a clip cannot be decoded to PCM
+    """
+    pass
+
+
+class AudioAnalyzer:
+    """
+    Timing analysis of recorded answers, no model calls involved
+
+    WAV clips are read with the `wave` module; anything else (webm, ogg, mp3,
+    ...) is decoded by an `ffmpeg` subprocess to 16-bit mono PCM. Frames of
+    `frame_ms` are voiced when their RMS level is `snr_db` above the clip's
+    noise floor (10th percentile) and above `silence_db` dBFS. Silences of at
+    least `min_pause` seconds between the first and last voiced frame are
+    pauses; shorter gaps count as speaking time.
+    """
+
+    def __init__(
+        self,
+        frame_ms: float = 30.0,
+        min_pause: float = 0.5,
+        snr_db: float = 10.0,
+        silence_db: float = -50.0,
+        sample_rate: int = 16000,
+        ffmpeg: str = 'ffmpeg',
+        timeout: float = 30.0
+    ):
+        self.frame_ms = frame_ms
+        self.min_pause = min_pause
+        self.snr_db = snr_db
+        self.silence_db = silence_db
+        self.sample_rate = sample_rate
+        self.ffmpeg = ffmpeg
+        self.timeout = timeout
+
+    @property
+    def config_id(self) -> str:
+        """
+        The settings that change measurements (for cache keys)
+        """
+        return f"vad/{self.frame_ms}/{self.min_pause}/{self.snr_db}/{self.silence_db}"
+
+    def analyze(self, audio_data: bytes, audio_format: str = 'webm') -> Dict[str, Any]:
+        """
+        Decode a clip and measure its timing
+
+        Args:
+            audio_data: Encoded audio clip
+            audio_format: Audio format (webm, mp3, wav, etc.)
+
+        Returns:
+            duration, speaking_duration, pause_duration and longest_pause (seconds)
+            and pauses_count
+
+        Raises:
+            AudioDecodeError: If the clip cannot be decoded
+        """
+        samples, sample_rate = self.decode(audio_data, audio_format)
+        return self.measure(samples, sample_rate)
+
+    def decode(self, audio_data: bytes, audio_format: str = 'webm') -> Tuple[np.ndarray, int]:
+        """
+        Decode a clip to mono float32 samples in [-1, 1]
+
+        Returns:
+            (samples, sample_rate)
+        """
+        if audio_format.lower() == 'wav' or audio_data[:4] == b'RIFF':
+            try:
+                return self._decode_wav(audio_data)
+            except (wave.Error, EOFError, ValueError) as e:
+                raise AudioDecodeError(f"Invalid WAV audio: {e}") from e
+        return self._decode_ffmpeg(audio_data)
+
+    def measure(self, samples: np.ndarray, sample_rate: int) -> Dict[str, Any]:
+        """
+        Timing of decoded samples (see class docstring for the method)
+        """
+        duration = len(samples) / sample_rate
+        frame_length = max(1, int(sample_rate * self.frame_ms / 1000))
+        frame_count = len(samples) // frame_length
+        silent = {
+            'duration': duration,
+            'speaking_duration': 0.0,
+            'pauses_count': 0,
+            'pause_duration': 0.0,
+            'longest_pause': 0.0
+        }
+        if frame_count == 0:
+            return silent
+
+        frames = samples[:frame_count * frame_length].reshape(frame_count, frame_length)
+        # RMS around each frame's mean, so a DC offset does not read as sound
+        rms = np.std(frames, axis=1, dtype=np.float64)
+        level_db = 20 * np.log10(rms + 1e-10)
+
+        noise_floor = np.percentile(level_db, 10)
+        peak = np.percentile(level_db, 95)
+        # With little dynamic range (speech throughout) the floor is speech itself
+        threshold = max(min(noise_floor + self.snr_db, peak - self.snr_db), self.silence_db)
+        voiced = level_db > threshold
+
+        voiced_frames = np.flatnonzero(voiced)
+        if len(voiced_frames) == 0:
+            return silent
+
+        # Silent runs strictly between the first and last voiced frame
+        span = voiced[voiced_frames[0]:voiced_frames[-1] + 1]
+        edges = np.diff(np.concatenate(([0], (~span).astype(np.int8), [0])))
+        run_lengths = np.flatnonzero(edges == -1) - np.flatnonzero(edges == 1)
+
+        frame_seconds = frame_length / sample_rate
+        pauses = run_lengths[run_lengths * frame_seconds >= self.min_pause] * frame_seconds
+        pause_duration = float(pauses.sum())
+
+        return {
+            'duration': duration,
+            'speaking_duration': len(span) * frame_seconds - pause_duration,
+            'pauses_count': int(len(pauses)),
+            'pause_duration': pause_duration,
+            'longest_pause': float(pauses.max()) if len(pauses) else 0.0
+        }
+
+    @staticmethod
+    def _decode_wav(audio_data: bytes) -> Tuple[np.ndarray, int]:
+        with wave.open(io.BytesIO(audio_data)) as clip:
+            channels = clip.getnchannels()
+            width = clip.getsampwidth()
+            sample_rate = clip.getframerate()
+            raw = clip.readframes(clip.getnframes())
+
+        if width == 1:
+            samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128) / 128
+        elif width == 2:
+            samples = np.frombuffer(raw, dtype='<i2').astype(np.float32) / 32768
+        elif width == 3:
+            packed = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3)
+            values = (packed[:, 0].astype(np.int32) | (packed[:, 1].astype(np.int32) << 8)
+                      | (packed[:, 2].astype(np.int32) << 16))
+            samples = (np.where(values >= 1 << 23, values - (1 << 24), values) / float(1 << 23)).astype(np.float32)
+        elif width == 4:
+            samples = np.frombuffer(raw, dtype='<i4').astype(np.float32) / 2147483648
+        else:
+            raise ValueError(f"unsupported sample width {width}")
+
+        if channels > 1:
+            samples = samples.reshape(-1, channels).mean(axis=1)
+        return samples, sample_rate
+
+    def _decode_ffmpeg(self, audio_data: bytes) -> Tuple[np.ndarray, int]:
+        command = [
+            self.ffmpeg, '-v', 'error', '-i', 'pipe:0',
+            '-f', 's16le', '-ac', '1', '-ar', str(self.sample_rate), 'pipe:1'
+        ]
+        try:
+            decoded = subprocess.run(command, input=audio_data, capture_output=True, timeout=self.timeout)
+        except FileNotFoundError as e:
+            raise AudioDecodeError(f"ffmpeg not found ({self.ffmpeg}); only WAV clips can be analyzed") from e
+        except subprocess.TimeoutExpired as e:
+            raise AudioDecodeError(f"ffmpeg timed out after {self.timeout}s") from e
+
+        if decoded.returncode != 0:
+            raise AudioDecodeError(f"ffmpeg could not decode the clip: {decoded.stderr.decode(errors='replace').strip()}")
+        return np.frombuffer(decoded.stdout, dtype='<i2').astype(np.float32) / 32768, self.sample_rate
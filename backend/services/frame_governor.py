@@ -0,0 +1,167 @@
+"""
+Per-session frame-rate governor
+Tells each client how long to wait before its next frame and drops frames that arrive too early
+"""
+import math
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Optional
+
+
+class _SessionRate:
+    """
+    Governor state for one session
+    """
+
+    def __init__(self, history: int, base_interval: float):
+        self.last_accepted: Optional[float] = None
+        self.interval = base_interval
+        self.latency: Optional[float] = None
+        self.gaze: Deque[float] = deque(maxlen=history)
+        self.posture: Deque[float] = deque(maxlen=history)
+
+
+class FrameGovernor:
+    """
+    Recommends a next-capture interval per session and enforces it
+
+    The interval starts from `base_interval` and is:
+    - stretched when the session's gaze and posture scores are stable (little
+      to learn from more frames) and shortened when they are changing,
+    - stretched with the load on the session's worker queue,
+    - never shorter than `latency_headroom` times the recent per-frame latency,
+    and clamped to [min_interval, max_interval]. With `enforce`, a frame that
+    arrives before `tolerance` times the recommended interval has passed is
+    rejected.
+    """
+
+    def __init__(
+        self,
+        base_interval: float = 3.0,
+        min_interval: float = 1.0,
+        max_interval: float = 6.0,
+        tolerance: float = 0.8,
+        latency_headroom: float = 2.0,
+        history: int = 8,
+        max_sessions: int = 1024,
+        enforce: bool = True
+    ):
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.tolerance = tolerance
+        self.latency_headroom = latency_headroom
+        self.history = max(2, history)
+        self.max_sessions = max(1, max_sessions)
+        self.enforce = enforce
+
+        self._sessions: "OrderedDict[str, _SessionRate]" = OrderedDict()
+
+        # Counters
+        self.accepted = 0
+        self.throttled = 0
+
+    def admit(self, session_id: str, now: Optional[float] = None) -> Optional[float]:
+        """
+        Check whether a session may send a frame now
+
+        Args:
+            session_id: Interview session identifier
+            now: Arrival time (time.monotonic() by default)
+
+        Returns:
+            None if the frame is accepted, otherwise seconds until the next frame is welcome
+        """
+        now = time.monotonic() if now is None else now
+        state = self._session(session_id)
+
+        if self.enforce and state.last_accepted is not None:
+            earliest = state.last_accepted + state.interval * self.tolerance
+            if now < earliest:
+                self.throttled += 1
+                return earliest - now
+
+        state.last_accepted = now
+        self.accepted += 1
+        return None
+
+    def record(
+        self,
+        session_id: str,
+        result: Dict[str, Any],
+        latency: float,
+        load: float = 0.0
+    ) -> float:
+        """
+        Feed back an analyzed frame and update the session's recommended interval
+
+        Args:
+            session_id: Interview session identifier
+            result: VisionAnalyzer result for the frame
+            latency: Seconds from request to result (queueing included)
+            load: Queue fullness (0-1) of the session's worker
+
+        Returns:
+            Recommended interval in seconds before the next frame
+        """
+        state = self._session(session_id)
+        state.gaze.append(result['eye_contact']['gaze_score'])
+        state.posture.append(result['posture']['posture_score'])
+        state.latency = latency if state.latency is None else 0.7 * state.latency + 0.3 * latency
+
+        interval = self.base_interval * self._stability_factor(state) * (1.0 + 2.0 * min(1.0, max(0.0, load)))
+        interval = max(interval, state.latency * self.latency_headroom)
+        state.interval = min(self.max_interval, max(self.min_interval, interval))
+        return state.interval
+
+    def recommended_interval_ms(self, session_id: str) -> int:
+        """
+        Current recommendation for a session in milliseconds
+        """
+        state = self._sessions.get(session_id)
+        return int(math.ceil((state.interval if state else self.base_interval) * 1000))
+
+    def forget(self, session_id: str) -> None:
+        """
+        Drop a session's state (e.g. when the interview ends)
+        """
+        self._sessions.pop(session_id, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Governor counters and the spread of current recommendations
+        """
+        intervals = [state.interval for state in self._sessions.values()]
+        return {
+            'sessions': len(self._sessions),
+            'accepted': self.accepted,
+            'throttled': self.throttled,
+            'min_recommended_ms': int(min(intervals) * 1000) if intervals else None,
+            'max_recommended_ms': int(max(intervals) * 1000) if intervals else None
+        }
+
+    def _session(self, session_id: str) -> _SessionRate:
+        state = self._sessions.get(session_id)
+        if state is None:
+            state = _SessionRate(self.history, self.base_interval)
+            self._sessions[session_id] = state
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        else:
+            self._sessions.move_to_end(session_id)
+        return state
+
+    @staticmethod
+    def _stability_factor(state: _SessionRate) -> float:
+        """
+        1.5 when gaze and posture hold steady, down to 0.5 when they swing
+        """
+        if len(state.gaze) < 2:
+            return 1.0
+        variability = max(_std(state.gaze), _std(state.posture))
+        return 1.5 - min(1.0, max(0.0, (variability - 0.05) / 0.2))
+
+
+def _std(values: Deque[float]) -> float:
+    mean = sum(values) / len(values)
+    return math.sqrt(sum((value - mean) ** 2 for value in values) / len(values))
@@ -0,0 +1,54 @@
+"""
+Latest-frame buffering for streamed video analysis
+Keeps only the newest frame so a slow analyzer never builds up a backlog
+"""
+import asyncio
+from typing import Optional, Tuple
+
+
+class LatestFrameSlot:
+    """
+    Single-slot mailbox between a WebSocket reader and the analysis loop
+
+    `put` overwrites any frame that has not been picked up yet, so when analysis
+    falls behind, stale frames are dropped instead of queued.
+    """
+
+    def __init__(self):
+        self._frame: Optional[bytes] = None
+        self._timestamp: float = 0.0
+        self._ready = asyncio.Event()
+
+        # Counters
+        self.received = 0
+        self.dropped = 0
+
+    def put(self, frame: bytes, timestamp: float) -> bool:
+        """
+        Store a frame, replacing any frame still waiting
+
+        Returns:
+            True if a waiting frame was dropped
+        """
+        dropped = self._frame is not None
+        if dropped:
+            self.dropped += 1
+        self.received += 1
+
+        self._frame = frame
+        self._timestamp = timestamp
+        self._ready.set()
+        return dropped
+
+    async def get(self) -> Tuple[bytes, float]:
+        """
+        Wait for the newest frame and take it out of the slot
+        """
+        while self._frame is None:
+            self._ready.clear()
+            await self._ready.wait()
+
+        frame, timestamp = self._frame, self._timestamp
+        self._frame = None
+        self._ready.clear()
+        return frame, timestamp
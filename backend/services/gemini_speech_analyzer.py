@@ -2,196 +2,170 @@
 Speech Analysis using Google Gemini API
 Handles transcription and speech metrics without OpenAI
 """
-import base64
-import tempfile
-import os
+import asyncio
+import io
+import json
 import time
-from typing import Dict, Any
+from typing import Dict, Any, Set
 import google.generativeai as genai
-from utils.scoring import detect_filler_words, calculate_speech_pace
+from utils.scoring import transcription_result
+
+
+# Gemini rejects requests over 20 MB; leave room for the prompt and encoding
+DEFAULT_INLINE_MAX_BYTES = 14 * 1024 * 1024
+
+AUDIO_MIME_TYPES = {
+    'webm': 'audio/webm',
+    'ogg': 'audio/ogg',
+    'mp3': 'audio/mpeg',
+    'mpeg': 'audio/mpeg',
+    'wav': 'audio/wav',
+    'm4a': 'audio/mp4',
+    'mp4': 'audio/mp4',
+    'aac': 'audio/aac',
+    'flac': 'audio/flac'
+}
+
+TRANSCRIBE_PROMPT = """Transcribe this audio recording accurately. 
+                
+Return ONLY a JSON object with this exact structure (no markdown, no extra text):
+{
+    "text": "the complete transcription",
+    "duration_seconds": estimated duration in seconds (number),
+    "word_count": number of words spoken
+}"""
 
 
 class GeminiSpeechAnalyzer:
     """
     Analyzes speech using Google Gemini API
+    
+    Clips up to `inline_max_bytes` are sent inline with the transcription
+    request. Larger ones go through the File API: uploaded from memory, polled
+    with a short exponential backoff until ACTIVE, and deleted in the
+    background once transcribed. No network call blocks the event loop.
     """
     
-    def __init__(self, api_key: str):
+    name = 'gemini'
+    model_id = 'gemini-2.0-flash'
+    
+    def __init__(
+        self,
+        api_key: str,
+        inline_max_bytes: int = DEFAULT_INLINE_MAX_BYTES,
+        upload_timeout: float = 30.0
+    ):
         genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-2.0-flash')
+        self.model = genai.GenerativeModel(self.model_id)
+        self.inline_max_bytes = inline_max_bytes
+        self.upload_timeout = upload_timeout
+        
+        # Pending remote file deletions (kept referenced until they finish)
+        self._cleanup_tasks: Set[asyncio.Task] = set()
+        
+        # Counters
+        self.inline_requests = 0
+        self.uploaded_requests = 0
     
-    def transcribe_audio(self, audio_base64: str, audio_format: str = "webm") -> Dict[str, Any]:
+    async def transcribe_audio_bytes(self, audio_data: bytes, audio_format: str = "webm") -> Dict[str, Any]:
         """
-        Transcribe audio using Gemini API
+        Transcribe raw (already decoded) audio using Gemini API
         
         Args:
-            audio_base64: Base64 encoded audio data
+            audio_data: Encoded audio clip
             audio_format: Audio format (webm, mp3, wav, etc.)
             
         Returns:
             Dictionary with transcription and metrics
         """
         try:
-            # Decode base64 audio
-            if ',' in audio_base64:
-                audio_base64 = audio_base64.split(',')[1]
+            mime_type = AUDIO_MIME_TYPES.get(audio_format.lower(), f'audio/{audio_format.lower()}')
             
-            audio_data = base64.b64decode(audio_base64)
-            
-            # Create temporary file
-            with tempfile.NamedTemporaryFile(
-                delete=False,
-                suffix=f'.{audio_format}'
-            ) as temp_audio:
-                temp_audio.write(audio_data)
-                temp_audio_path = temp_audio.name
+            uploaded_file = None
+            if len(audio_data) <= self.inline_max_bytes:
+                audio_part = {'mime_type': mime_type, 'data': audio_data}
+                self.inline_requests += 1
+            else:
+                uploaded_file = await self._upload_audio(audio_data, mime_type)
+                audio_part = uploaded_file
+                self.uploaded_requests += 1
             
             try:
-                # Upload audio file to Gemini
-                print(f"Uploading audio file to Gemini: {temp_audio_path}")
-                audio_file = genai.upload_file(temp_audio_path)
-                
-                # Wait for file to be processed (ACTIVE state)
-                print(f"Waiting for file to be processed... State: {audio_file.state.name}")
-                max_wait = 30  # Maximum 30 seconds
-                start_time = time.time()
-                
-                while audio_file.state.name != "ACTIVE":
-                    if time.time() - start_time > max_wait:
-                        raise Exception(f"File processing timeout. State: {audio_file.state.name}")
-                    
-                    time.sleep(1)
-                    audio_file = genai.get_file(audio_file.name)
-                    print(f"File state: {audio_file.state.name}")
-                
-                print(f"✅ File is ACTIVE and ready for transcription")
-                
-                # Transcribe using Gemini
-                prompt = """Transcribe this audio recording accurately. 
-                
-Return ONLY a JSON object with this exact structure (no markdown, no extra text):
-{
-    "text": "the complete transcription",
-    "duration_seconds": estimated duration in seconds (number),
-    "word_count": number of words spoken
-}"""
-                
-                response = self.model.generate_content([prompt, audio_file])
-                result_text = response.text.strip()
-                
-                # Remove markdown code blocks if present
-                if result_text.startswith('```json'):
-                    result_text = result_text[7:]
-                if result_text.startswith('```'):
-                    result_text = result_text[3:]
-                if result_text.endswith('```'):
-                    result_text = result_text[:-3]
-                result_text = result_text.strip()
-                
-                import json
-                result = json.loads(result_text)
-                
-                # Extract data
-                text = result.get('text', '')
-                duration = float(result.get('duration_seconds', 0))
-                word_count = result.get('word_count', len(text.split()))
-                
-                # Calculate metrics
-                words_per_minute = calculate_speech_pace(word_count, duration)
-                
-                # Detect filler words
-                filler_analysis = detect_filler_words(text)
-                
-                print(f"Gemini transcription successful: {word_count} words, {duration}s, {words_per_minute} WPM")
-                
-                # Clean up uploaded file from Gemini
-                try:
-                    genai.delete_file(audio_file.name)
-                    print(f"✅ Cleaned up Gemini file: {audio_file.name}")
-                except Exception as cleanup_error:
-                    print(f"Warning: Could not delete Gemini file: {cleanup_error}")
-                
-                return {
-                    'text': text,
-                    'duration': duration,
-                    'word_count': word_count,
-                    'words_per_minute': words_per_minute,
-                    'filler_words': filler_analysis['filler_words'],
-                    'total_filler_count': filler_analysis['total_filler_count'],
-                    'filler_percentage': filler_analysis['filler_percentage']
-                }
-            
+                response = await self.model.generate_content_async([TRANSCRIBE_PROMPT, audio_part])
             finally:
-                # Clean up temporary file
-                if os.path.exists(temp_audio_path):
-                    os.unlink(temp_audio_path)
+                if uploaded_file is not None:
+                    self._delete_in_background(uploaded_file.name)
+            
+            result_text = response.text.strip()
+            
+            # Remove markdown code blocks if present
+            if result_text.startswith('```json'):
+                result_text = result_text[7:]
+            if result_text.startswith('```'):
+                result_text = result_text[3:]
+            if result_text.endswith('```'):
+                result_text = result_text[:-3]
+            result_text = result_text.strip()
+            
+            result = json.loads(result_text)
+            
+            # Extract data
+            text = result.get('text', '')
+            duration = float(result.get('duration_seconds', 0))
+            word_count = result.get('word_count', len(text.split()))
+            
+            print(f"Gemini transcription successful: {word_count} words, {duration}s")
+            
+            return transcription_result(text, duration, word_count)
         
         except Exception as e:
             print(f"Error transcribing audio with Gemini: {e}")
             # Fallback: estimate from audio size
-            try:
-                audio_data = base64.b64decode(audio_base64.split(',')[1] if ',' in audio_base64 else audio_base64)
-                estimated_duration = len(audio_data) / 16000  # Rough estimate
-                
-                return {
-                    'text': '[Audio transcription unavailable - please speak your answer]',
-                    'duration': estimated_duration,
-                    'word_count': 0,
-                    'words_per_minute': 0.0,
-                    'filler_words': {},
-                    'total_filler_count': 0,
-                    'filler_percentage': 0.0,
-                    'error': str(e)
-                }
-            except:
-                return {
-                    'text': '',
-                    'duration': 0.0,
-                    'word_count': 0,
-                    'words_per_minute': 0.0,
-                    'filler_words': {},
-                    'total_filler_count': 0,
-                    'filler_percentage': 0.0,
-                    'error': str(e)
-                }
+            estimated_duration = len(audio_data) / 16000  # Rough estimate
+            
+            return transcription_result(
+                '[Audio transcription unavailable - please speak your answer]',
+                estimated_duration,
+                0,
+                error=str(e)
+            )
     
-    def analyze_speech_patterns(self, transcriptions: list) -> Dict[str, Any]:
+    async def _upload_audio(self, audio_data: bytes, mime_type: str):
         """
-        Analyze speech patterns across multiple transcriptions
-        
-        Args:
-            transcriptions: List of transcription results
-            
-        Returns:
-            Aggregated speech metrics
+        Upload audio from memory to the File API and wait until it is ACTIVE
         """
-        if not transcriptions:
-            return {
-                'total_words': 0,
-                'average_wpm': 0.0,
-                'total_filler_count': 0,
-                'filler_percentage': 0.0,
-                'clarity_score': 50.0
-            }
+        audio_file = await asyncio.to_thread(
+            genai.upload_file, io.BytesIO(audio_data), mime_type=mime_type
+        )
+        print(f"Uploaded {len(audio_data)} bytes of audio to Gemini: {audio_file.name}")
         
-        total_words = sum(t.get('word_count', 0) for t in transcriptions)
-        total_duration = sum(t.get('duration', 0) for t in transcriptions)
-        total_filler_count = sum(t.get('total_filler_count', 0) for t in transcriptions)
-        
-        average_wpm = calculate_speech_pace(total_words, total_duration)
-        filler_percentage = (total_filler_count / total_words * 100) if total_words > 0 else 0
-        
-        # Calculate clarity score
-        # Ideal WPM: 120-160, penalize for filler words
-        optimal_wpm = 140
-        wpm_score = 100 - min(50, abs(average_wpm - optimal_wpm) / 2)
-        filler_penalty = filler_percentage * 2
-        clarity_score = max(0, min(100, wpm_score - filler_penalty))
+        started = time.monotonic()
+        delay = 0.1
+        try:
+            while audio_file.state.name != "ACTIVE":
+                if audio_file.state.name == "FAILED":
+                    raise Exception(f"File processing failed: {audio_file.name}")
+                if time.monotonic() - started > self.upload_timeout:
+                    raise Exception(f"File processing timeout. State: {audio_file.state.name}")
+                
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 2.0)
+                audio_file = await asyncio.to_thread(genai.get_file, audio_file.name)
+        except Exception:
+            self._delete_in_background(audio_file.name)
+            raise
         
-        return {
-            'total_words': total_words,
-            'average_wpm': average_wpm,
-            'total_filler_count': total_filler_count,
-            'filler_percentage': filler_percentage,
-            'clarity_score': clarity_score
-        }
+        return audio_file
+    
+    def _delete_in_background(self, name: str) -> None:
+        task = asyncio.get_running_loop().create_task(asyncio.to_thread(self._delete_file, name))
+        self._cleanup_tasks.add(task)
+        task.add_done_callback(self._cleanup_tasks.discard)
+    
+    @staticmethod
+    def _delete_file(name: str) -> None:
+        try:
+            genai.delete_file(name)
+            print(f"✅ Cleaned up Gemini file: {name}")
+        except Exception as cleanup_error:
+            print(f"Warning: Could not delete Gemini file: {cleanup_error}")
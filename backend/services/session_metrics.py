@@ -0,0 +1,251 @@
+"""
+Server-side per-session frame metrics
+Collects each session's frame analysis results (and its answers' transcription
+timings) as they are produced, so the final report does not need the client to
+upload them again
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from utils.scoring import SessionScoreAccumulator
+
+
+# Column name -> (result section or None for top-level, key, dtype)
+FRAME_COLUMNS = {
+    'timestamp': (None, 'timestamp', np.float64),
+    'gaze_score': ('eye_contact', 'gaze_score', np.float32),
+    'looking_away_duration': ('eye_contact', 'looking_away_duration', np.float32),
+    'is_looking_at_camera': ('eye_contact', 'is_looking_at_camera', np.bool_),
+    'posture_score': ('posture', 'posture_score', np.float32),
+    'shoulder_alignment': ('posture', 'shoulder_alignment', np.float32),
+    'is_upright': ('posture', 'is_upright', np.bool_),
+    'slouch_detected': ('posture', 'slouch_detected', np.bool_),
+    'fidgeting_score': ('gestures', 'fidgeting_score', np.float32),
+    'gesture_count': ('gestures', 'gesture_count', np.int16),
+    'hand_detected': ('gestures', 'hand_detected', np.bool_),
+    'confidence_level': ('expressions', 'confidence_level', np.float32),
+    'engagement_score': ('expressions', 'engagement_score', np.float32),
+    'smile_detected': ('expressions', 'smile_detected', np.bool_),
+    'overall_confidence': (None, 'overall_confidence', np.float32)
+}
+
+
+class FrameColumns:
+    """
+    Columnar frame metrics for one session
+
+    Each metric lives in its own preallocated NumPy array that doubles in size
+    as frames arrive (amortized O(1) append). Once `max_frames` are stored,
+    every other frame is dropped and from then on only every `stride`-th frame
+    is kept, so an arbitrarily long session stays evenly sampled in bounded memory.
+    """
+
+    def __init__(self, initial_capacity: int = 256, max_frames: int = 20000):
+        self.max_frames = max(2, max_frames)
+        capacity = max(1, min(initial_capacity, self.max_frames))
+        self._arrays = {
+            name: np.empty(capacity, dtype=dtype)
+            for name, (_, _, dtype) in FRAME_COLUMNS.items()
+        }
+        self._size = 0
+        self._seen = 0
+        self.stride = 1
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def frames_seen(self) -> int:
+        return self._seen
+
+    @property
+    def nbytes(self) -> int:
+        return sum(array.nbytes for array in self._arrays.values())
+
+    def append(self, result: Dict[str, Any]) -> None:
+        """
+        Add one VisionAnalyzer result (skipped if it falls between kept samples)
+        """
+        keep = self._seen % self.stride == 0
+        self._seen += 1
+        if not keep:
+            return
+
+        if self._size == self.max_frames:
+            self._decimate()
+            if (self._seen - 1) % self.stride != 0:
+                return
+        if self._size == len(self._arrays['timestamp']):
+            self._grow()
+
+        index = self._size
+        for name, (section, key, _) in FRAME_COLUMNS.items():
+            source = result[section] if section else result
+            self._arrays[name][index] = source[key]
+        self._size += 1
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """
+        Read-only views of the stored frames (no copies)
+        """
+        views = {}
+        for name, array in self._arrays.items():
+            view = array[:self._size]
+            view.flags.writeable = False
+            views[name] = view
+        return views
+
+    def _grow(self) -> None:
+        capacity = min(self.max_frames, 2 * len(self._arrays['timestamp']))
+        for name, array in self._arrays.items():
+            grown = np.empty(capacity, dtype=array.dtype)
+            grown[:self._size] = array[:self._size]
+            self._arrays[name] = grown
+
+    def _decimate(self) -> None:
+        kept = (self._size + 1) // 2
+        for array in self._arrays.values():
+            array[:kept] = array[:self._size:2]
+        self._size = kept
+        self.stride *= 2
+
+
+class SessionRecord:
+    """
+    Everything kept for one session: the frame columns (thinned once full),
+    running scores over every frame and the transcription results of its
+    answers, keyed by transcribed text
+    """
+
+    def __init__(self, max_frames: int):
+        self.frames = FrameColumns(max_frames=max_frames)
+        self.scores = SessionScoreAccumulator()
+        self.transcriptions: Dict[str, Dict[str, Any]] = {}
+
+    def append(self, result: Dict[str, Any]) -> None:
+        self.frames.append(result)
+        self.scores.update(result)
+
+
+class SessionMetricsStore:
+    """
+    In-memory frame metrics keyed by session ID
+
+    Sessions are kept in LRU order. Sessions that were never ended are dropped
+    after `idle_ttl` seconds without frames, or when more than `max_sessions`
+    are open.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 256,
+        idle_ttl: float = 3600.0,
+        max_frames: int = 20000
+    ):
+        self.max_sessions = max(1, max_sessions)
+        self.idle_ttl = idle_ttl
+        self.max_frames = max_frames
+
+        self._sessions: "OrderedDict[str, SessionRecord]" = OrderedDict()
+        self._last_used: Dict[str, float] = {}
+
+        # Counters
+        self.recorded = 0
+        self.expired = 0
+
+    def append(self, session_id: str, result: Dict[str, Any]) -> None:
+        """
+        Record one frame analysis result for a session
+        """
+        self._session(session_id).append(result)
+        self.recorded += 1
+
+    def extend(self, session_id: str, results: List[Dict[str, Any]]) -> None:
+        """
+        Record several frame analysis results for a session, in order
+        """
+        record = self._session(session_id)
+        for result in results:
+            record.append(result)
+        self.recorded += len(results)
+
+    def add_transcription(self, session_id: str, result: Dict[str, Any]) -> None:
+        """
+        Record a successful transcription result for one of a session's answers
+        """
+        self._session(session_id).transcriptions[result['text']] = result
+
+    def transcriptions(self, session_id: str) -> Dict[str, Dict[str, Any]]:
+        """
+        A session's transcription results keyed by text (empty if unknown)
+        """
+        record = self._sessions.get(session_id)
+        return record.transcriptions if record is not None else {}
+
+    def columns(self, session_id: str) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Read-only column views of a session's frames (None if unknown)
+        """
+        record = self._sessions.get(session_id)
+        return record.frames.columns() if record is not None else None
+
+    def scores(self, session_id: str) -> Optional[SessionScoreAccumulator]:
+        """
+        Running scores over every frame of a session (None if unknown)
+        """
+        record = self._sessions.get(session_id)
+        return record.scores if record is not None else None
+
+    def frame_count(self, session_id: str) -> int:
+        """
+        Frames recorded for a session (including any thinned out of the columns)
+        """
+        record = self._sessions.get(session_id)
+        return record.frames.frames_seen if record is not None else 0
+
+    def discard(self, session_id: str) -> None:
+        """
+        Forget a session's frames and transcriptions (e.g. once its report has been generated)
+        """
+        self._sessions.pop(session_id, None)
+        self._last_used.pop(session_id, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'sessions': len(self._sessions),
+            'frames': sum(len(record.frames) for record in self._sessions.values()),
+            'bytes': sum(record.frames.nbytes for record in self._sessions.values()),
+            'recorded': self.recorded,
+            'expired': self.expired
+        }
+
+    def _session(self, session_id: str) -> SessionRecord:
+        now = time.monotonic()
+        self._expire(now)
+
+        record = self._sessions.get(session_id)
+        if record is None:
+            record = SessionRecord(self.max_frames)
+            self._sessions[session_id] = record
+            while len(self._sessions) > self.max_sessions:
+                oldest = next(iter(self._sessions))
+                self.discard(oldest)
+                self.expired += 1
+        else:
+            self._sessions.move_to_end(session_id)
+        self._last_used[session_id] = now
+        return record
+
+    def _expire(self, now: float) -> None:
+        if self.idle_ttl <= 0:
+            return
+        idle = [
+            session_id for session_id, last_used in self._last_used.items()
+            if now - last_used > self.idle_ttl
+        ]
+        for session_id in idle:
+            self.discard(session_id)
+            self.expired += 1
@@ -0,0 +1,340 @@
+"""
+Pluggable transcription backends
+Gemini, the Whisper API, a local CPU Whisper model and a deterministic stub all
+implement TranscriptionBackend; TranscriptionRouter picks one per clip and
+records per-backend latency, optionally replacing the backend's timing with a
+local measurement of the audio itself and answering repeated clips from a cache
+"""
+import asyncio
+import base64
+import io
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Protocol
+
+from services.audio_analysis import AudioAnalyzer
+from services.gemini_speech_analyzer import GeminiSpeechAnalyzer
+from services.speech_analyzer import SpeechAnalyzer
+from services.transcription_cache import TranscriptionCache
+from utils.scoring import calculate_speech_pace, transcription_result
+
+
+class TranscriptionBackend(Protocol):
+    """
+    Anything that can turn an encoded audio clip into a transcription result
+
+    Results have the keys of utils.scoring.transcription_result; failures are
+    reported with an 'error' key rather than raised. `model_id` names the model
+    (and any settings that change its output), e.g. for cache keys.
+    """
+
+    name: str
+    model_id: str
+
+    async def transcribe_audio_bytes(self, audio_data: bytes, audio_format: str = "webm") -> Dict[str, Any]:
+        ...
+
+
+class LocalWhisperBackend:
+    """
+    Offline transcription with faster-whisper on the CPU
+
+    Needs the optional `faster-whisper` package; the model is downloaded on
+    first use unless `model` points at a local directory.
+    """
+
+    name = 'local'
+
+    def __init__(
+        self,
+        model: str = 'base.en',
+        compute_type: str = 'int8',
+        cpu_threads: int = 0,
+        beam_size: int = 1
+    ):
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError as e:
+            raise ImportError(
+                "The local transcription backend needs faster-whisper (pip install faster-whisper)"
+            ) from e
+
+        self.model = WhisperModel(model, device='cpu', compute_type=compute_type, cpu_threads=cpu_threads)
+        self.model_id = f"{model}/{compute_type}/beam{beam_size}"
+        self.beam_size = beam_size
+
+    async def transcribe_audio_bytes(self, audio_data: bytes, audio_format: str = "webm") -> Dict[str, Any]:
+        try:
+            text, duration = await asyncio.to_thread(self._transcribe, audio_data)
+            return transcription_result(text, duration)
+        except Exception as e:
+            print(f"Error transcribing audio locally: {e}")
+            return transcription_result('', 0.0, 0, error=str(e))
+
+    def _transcribe(self, audio_data: bytes):
+        # faster-whisper decodes any container ffmpeg/PyAV understands
+        segments, info = self.model.transcribe(io.BytesIO(audio_data), beam_size=self.beam_size)
+        text = ' '.join(segment.text.strip() for segment in segments)
+        return text, float(info.duration)
+
+
+class StubTranscriptionBackend:
+    """
+    Deterministic, offline backend for tests and local development
+
+    Always returns `text`; the duration is derived from the clip size.
+    """
+
+    name = 'stub'
+    model_id = 'fixed-text'
+
+    def __init__(
+        self,
+        text: str = "So I led the migration and, um, we cut latency in half.",
+        bytes_per_second: float = 16000.0
+    ):
+        self.text = text
+        self.bytes_per_second = bytes_per_second
+
+    async def transcribe_audio_bytes(self, audio_data: bytes, audio_format: str = "webm") -> Dict[str, Any]:
+        return transcription_result(self.text, len(audio_data) / self.bytes_per_second)
+
+
+BACKENDS = {
+    GeminiSpeechAnalyzer.name: GeminiSpeechAnalyzer,
+    SpeechAnalyzer.name: SpeechAnalyzer,
+    LocalWhisperBackend.name: LocalWhisperBackend,
+    StubTranscriptionBackend.name: StubTranscriptionBackend
+}
+
+
+class _BackendStats:
+    """
+    Latency record for one backend
+    """
+
+    def __init__(self, history: int):
+        self.requests = 0
+        self.errors = 0
+        self.total_latency = 0.0
+        self.recent: Deque[float] = deque(maxlen=history)
+
+    def record(self, latency: float, failed: bool) -> None:
+        self.requests += 1
+        self.errors += int(failed)
+        self.total_latency += latency
+        self.recent.append(latency)
+
+    def summary(self) -> Dict[str, Any]:
+        recent = sorted(self.recent)
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'avg_latency_ms': round(self.total_latency / self.requests * 1000, 1) if self.requests else None,
+            'p50_latency_ms': round(recent[len(recent) // 2] * 1000, 1) if recent else None,
+            'p95_latency_ms': round(recent[min(len(recent) - 1, int(len(recent) * 0.95))] * 1000, 1) if recent else None
+        }
+
+
+class TranscriptionRouter:
+    """
+    Routes each clip to a backend and records per-backend latency
+
+    Clips up to `short_clip_max_bytes` go to `short_clip_backend` (e.g. the local
+    engine, skipping a network round trip and per-call cost); everything else,
+    and any short clip whose backend fails, goes to the default backend.
+
+    With an `audio_analyzer`, each clip is also decoded and measured locally
+    while it is being transcribed; successful results then carry the exact
+    duration, `speaking_duration` and `pauses_count`, and `words_per_minute`
+    counts speaking time only. Clips the analyzer cannot decode keep the
+    backend's timing.
+
+    With a `cache`, successful results are stored under the hash of the clip
+    and the routed backend's model, so a re-submitted clip is answered from
+    memory (marked `cached`), and concurrent requests for the same clip share
+    one backend call.
+    """
+
+    def __init__(
+        self,
+        backends: Dict[str, TranscriptionBackend],
+        default: str,
+        short_clip_backend: Optional[str] = None,
+        short_clip_max_bytes: int = 512 * 1024,
+        history: int = 200,
+        audio_analyzer: Optional[AudioAnalyzer] = None,
+        cache: Optional[TranscriptionCache] = None
+    ):
+        for name in (default, short_clip_backend):
+            if name is not None and name not in backends:
+                raise ValueError(f"Transcription backend '{name}' is not configured (have {sorted(backends)})")
+
+        self.backends = backends
+        self.default = default
+        self.short_clip_backend = short_clip_backend
+        self.short_clip_max_bytes = short_clip_max_bytes
+        self.audio_analyzer = audio_analyzer
+        self.cache = cache
+
+        self._stats = {name: _BackendStats(history) for name in backends}
+        # Cache key -> transcription in progress for that clip
+        self._pending: Dict[str, asyncio.Task] = {}
+
+        # Counters
+        self.fallbacks = 0
+        self.timings_measured = 0
+        self.timing_failures = 0
+        self.coalesced = 0
+
+    @property
+    def name(self) -> str:
+        return self.default
+
+    async def transcribe_audio(self, audio_base64: str, audio_format: str = "webm") -> Dict[str, Any]:
+        """
+        Transcribe a base64 clip (a data URL prefix is allowed)
+        """
+        try:
+            # Decode base64 audio
+            if ',' in audio_base64:
+                audio_base64 = audio_base64.split(',')[1]
+
+            audio_data = base64.b64decode(audio_base64)
+        except Exception as e:
+            print(f"Error decoding audio: {e}")
+            return transcription_result('', 0.0, 0, error=str(e))
+
+        return await self.transcribe_audio_bytes(audio_data, audio_format)
+
+    async def transcribe_audio_bytes(self, audio_data: bytes, audio_format: str = "webm") -> Dict[str, Any]:
+        """
+        Transcribe a clip with the backend chosen for its size
+
+        Returns:
+            The backend's result, plus 'backend' naming the backend that produced it
+            (and 'cached' when it was answered from the cache)
+        """
+        if self.cache is None:
+            return await self._transcribe(audio_data, audio_format)
+
+        model = self._model_id(self.route(len(audio_data)))
+        if len(audio_data) > 1024 * 1024:
+            # hashlib releases the GIL, so large clips are hashed off the event loop
+            key = await asyncio.to_thread(self.cache.key, audio_data, model)
+        else:
+            key = self.cache.key(audio_data, model)
+
+        result = self.cache.get(key)
+        if result is not None:
+            result['cached'] = True
+            return result
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            self.coalesced += 1
+        else:
+            pending = asyncio.create_task(self._transcribe_and_cache(key, audio_data, audio_format))
+            self._pending[key] = pending
+            pending.add_done_callback(lambda _: self._pending.pop(key, None))
+        # Shielded: a caller that goes away does not cancel the others' transcription
+        return dict(await asyncio.shield(pending))
+
+    def route(self, size: int) -> str:
+        """
+        Name of the backend a clip of `size` bytes goes to
+        """
+        if self.short_clip_backend is not None and size <= self.short_clip_max_bytes:
+            return self.short_clip_backend
+        return self.default
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'default': self.default,
+            'short_clip_backend': self.short_clip_backend,
+            'short_clip_max_bytes': self.short_clip_max_bytes,
+            'fallbacks': self.fallbacks,
+            'audio_analysis': self.audio_analyzer is not None,
+            'timings_measured': self.timings_measured,
+            'timing_failures': self.timing_failures,
+            'coalesced': self.coalesced,
+            'cache': self.cache.get_stats() if self.cache is not None else None,
+            'backends': {name: stats.summary() for name, stats in self._stats.items()}
+        }
+
+    async def _transcribe(self, audio_data: bytes, audio_format: str) -> Dict[str, Any]:
+        timing = None
+        if self.audio_analyzer is not None:
+            # Decoding runs in a worker thread alongside the backend call
+            timing = asyncio.create_task(asyncio.to_thread(self.audio_analyzer.analyze, audio_data, audio_format))
+
+        try:
+            name = self.route(len(audio_data))
+            result = await self._run(name, audio_data, audio_format)
+
+            if 'error' in result and name != self.default:
+                self.fallbacks += 1
+                name = self.default
+                result = await self._run(name, audio_data, audio_format)
+        except BaseException:
+            if timing is not None:
+                timing.cancel()
+            raise
+
+        if timing is not None:
+            await self._apply_timing(result, timing)
+        result['backend'] = name
+        return result
+
+    async def _transcribe_and_cache(self, key: str, audio_data: bytes, audio_format: str) -> Dict[str, Any]:
+        result = await self._transcribe(audio_data, audio_format)
+        # The key names the routed backend; a fallback's result is not its output,
+        # and leaving it uncached lets the routed backend try the clip again
+        if result['backend'] == self.route(len(audio_data)):
+            self.cache.put(key, result)
+        return result
+
+    def _model_id(self, name: str) -> str:
+        # Everything that shapes a result: backend, model and timing analysis settings
+        model_id = f"{name}/{getattr(self.backends[name], 'model_id', '')}"
+        if self.audio_analyzer is not None:
+            model_id += f"+{self.audio_analyzer.config_id}"
+        return model_id
+
+    async def _run(self, name: str, audio_data: bytes, audio_format: str) -> Dict[str, Any]:
+        started = time.perf_counter()
+        result = await self.backends[name].transcribe_audio_bytes(audio_data, audio_format)
+        self._stats[name].record(time.perf_counter() - started, 'error' in result)
+        return result
+
+    async def _apply_timing(self, result: Dict[str, Any], timing: "asyncio.Task[Dict[str, Any]]") -> None:
+        try:
+            measured = await timing
+        except Exception as e:
+            # Usually an AudioDecodeError (format without ffmpeg); never fail the transcription
+            self.timing_failures += 1
+            print(f"Audio analysis skipped: {e}")
+            return
+
+        self.timings_measured += 1
+        if 'error' in result:
+            return
+        result['duration'] = measured['duration']
+        result['speaking_duration'] = measured['speaking_duration']
+        result['pauses_count'] = measured['pauses_count']
+        result['pause_duration'] = measured['pause_duration']
+        result['words_per_minute'] = calculate_speech_pace(result['word_count'], measured['speaking_duration'])
+
+
+def create_transcription_backend(name: str, **options) -> TranscriptionBackend:
+    """
+    Build a transcription backend by name
+
+    Args:
+        name: One of BACKENDS ('gemini', 'whisper', 'local', 'stub')
+        **options: Backend-specific options (api_key for 'gemini' and 'whisper',
+            model/compute_type for 'local', text for 'stub')
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown transcription backend '{name}' (expected one of {sorted(BACKENDS)})")
+    return BACKENDS[name](**options)
@@ -0,0 +1,159 @@
+"""
+Content-addressed transcription cache
+Keeps finished transcription results keyed by a hash of the audio bytes and the
+model that produced them, so a retried or re-submitted clip is answered
+without another backend call
+"""
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class TranscriptionCache:
+    """
+    LRU cache of transcription results with a time-to-live
+
+    Entries are keyed by `key(audio_data, model)`. At most `max_entries` are
+    kept (least recently used evicted first) and entries older than `ttl`
+    seconds are treated as missing. With a `path`, entries are loaded from that
+    JSON file at startup and written back (atomically, at most every
+    `save_interval` seconds, and on `flush`), so the cache survives restarts.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        ttl: float = 86400.0,
+        path: Optional[str] = None,
+        save_interval: float = 5.0
+    ):
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self.path = path
+        self.save_interval = save_interval
+
+        # key -> (wall-clock time stored, so TTLs hold across restarts; result)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._dirty = False
+        self._last_saved = 0.0
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expired = 0
+
+        if path:
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(audio_data: bytes, model: str) -> str:
+        """
+        Cache key for a clip transcribed by `model` (a backend/model identifier)
+        """
+        digest = hashlib.sha256(audio_data).hexdigest()
+        return f"{model}:{digest}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        A copy of the cached result (None on a miss or an expired entry)
+        """
+        entry = self._entries.get(key)
+        if entry is not None and self._is_expired(entry[0], time.time()):
+            del self._entries[key]
+            self._dirty = True
+            self.expired += 1
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return dict(entry[1])
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """
+        Store a successful result (results with an 'error' key are not cached)
+        """
+        if 'error' in result:
+            return
+
+        self._entries[key] = (time.time(), dict(result))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        self._dirty = True
+
+        if self.path and time.monotonic() - self._last_saved >= self.save_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write the cache to `path` if anything changed since the last write
+        """
+        if not self.path or not self._dirty:
+            return
+
+        now = time.time()
+        entries = [
+            [key, stored_at, result]
+            for key, (stored_at, result) in self._entries.items()
+            if not self._is_expired(stored_at, now)
+        ]
+        temp_path = f"{self.path}.tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': 1, 'entries': entries}, f)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"WARNING: could not save transcription cache to {self.path}: {e}")
+            return
+
+        self._dirty = False
+        self._last_saved = time.monotonic()
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'ttl': self.ttl,
+            'persistent': bool(self.path),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else None,
+            'evictions': self.evictions,
+            'expired': self.expired
+        }
+
+    def _is_expired(self, stored_at: float, now: float) -> bool:
+        return self.ttl > 0 and now - stored_at > self.ttl
+
+    def _load(self) -> None:
+        now = time.time()
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                entries = json.load(f)['entries']
+            # Saved oldest-used first, so replaying keeps the LRU order
+            for key, stored_at, result in entries:
+                if not self._is_expired(stored_at, now):
+                    self._entries[key] = (stored_at, dict(result))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"WARNING: ignoring unreadable transcription cache {self.path}: {e}")
+            self._entries.clear()
+            return
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        print(f"✅ Loaded {len(self._entries)} cached transcriptions from {self.path}")
@@ -0,0 +1,136 @@
+"""
+Incremental transcription of an answer streamed in segments
+Transcribes each completed audio segment in the background while the candidate
+keeps talking, so only the last segment is left when the answer ends
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from utils.scoring import SpeechStatsAccumulator
+
+
+class SegmentTooLarge(Exception):
+    """
+    Raised when a segment grows past the stream's byte limit
+    """
+    pass
+
+
+class TranscriptionStream:
+    """
+    Ordered, incremental transcription of one answer
+
+    Audio chunks accumulate into the current segment until `end_segment`; each
+    segment must be a self-contained clip (e.g. one MediaRecorder start/stop).
+    Completed segments are transcribed one at a time, in order, by a background
+    task, and `on_partial` is called after each with the segment's result and
+    the running stats. `finish` closes the last segment and waits for the rest.
+    A segment whose transcription raises is reported like a failed one, and a
+    failing `on_partial` (e.g. a closed socket) never stops the worker.
+    """
+
+    def __init__(
+        self,
+        transcribe: Callable[[bytes, str], Awaitable[Dict[str, Any]]],
+        on_partial: Callable[[Dict[str, Any]], Awaitable[None]],
+        audio_format: str = "webm",
+        max_segment_bytes: int = 20 * 1024 * 1024
+    ):
+        self.transcribe = transcribe
+        self.on_partial = on_partial
+        self.audio_format = audio_format
+        self.max_segment_bytes = max_segment_bytes
+
+        self.stats = SpeechStatsAccumulator()
+        self._buffer = bytearray()
+        self._segments: "asyncio.Queue[Optional[bytes]]" = asyncio.Queue()
+        self._worker = asyncio.create_task(self._transcribe_segments())
+
+        # Counters
+        self.segments_queued = 0
+        self.segments_transcribed = 0
+        self.segments_failed = 0
+
+    def add_chunk(self, chunk: bytes) -> None:
+        """
+        Append audio to the current segment
+        """
+        if len(self._buffer) + len(chunk) > self.max_segment_bytes:
+            raise SegmentTooLarge(
+                f"Audio segment exceeds {self.max_segment_bytes} bytes; mark segment ends more often"
+            )
+        self._buffer.extend(chunk)
+
+    def end_segment(self) -> bool:
+        """
+        Queue the current segment for transcription
+
+        Returns:
+            False if the segment was empty (nothing queued)
+        """
+        if not self._buffer:
+            return False
+        self._segments.put_nowait(bytes(self._buffer))
+        self._buffer.clear()
+        self.segments_queued += 1
+        return True
+
+    async def finish(self) -> Dict[str, Any]:
+        """
+        Close the last segment, wait for every segment and return the final stats
+
+        Returns:
+            Running stats (see SpeechStatsAccumulator.snapshot) plus the full text
+        """
+        self.end_segment()
+        self._segments.put_nowait(None)
+        await self._worker
+        return {'text': self.stats.text, **self.stats.snapshot()}
+
+    def cancel(self) -> None:
+        self._worker.cancel()
+
+    async def _transcribe_segments(self) -> None:
+        index = 0
+        while True:
+            audio_data = await self._segments.get()
+            if audio_data is None:
+                return
+
+            try:
+                result = await self.transcribe(audio_data, self.audio_format)
+                if 'error' not in result:
+                    self.stats.update(
+                        result['text'],
+                        result['duration'],
+                        result['word_count'],
+                        speaking_duration=result.get('speaking_duration'),
+                        pauses_count=result.get('pauses_count', 0)
+                    )
+            except Exception as e:
+                print(f"Error transcribing segment {index}: {e}")
+                result = {'error': str(e)}
+
+            if 'error' in result:
+                self.segments_failed += 1
+                await self._send({
+                    'type': 'error',
+                    'segment': index,
+                    'error': result['error']
+                })
+            else:
+                self.segments_transcribed += 1
+                await self._send({
+                    'type': 'partial',
+                    'segment': index,
+                    'segment_text': result['text'],
+                    'text': self.stats.text,
+                    **self.stats.snapshot()
+                })
+            index += 1
+
+    async def _send(self, message: Dict[str, Any]) -> None:
+        try:
+            await self.on_partial(message)
+        except Exception as e:
+            print(f"Could not send {message['type']} message for segment {message['segment']}: {e}")
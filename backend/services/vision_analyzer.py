@@ -4,10 +4,127 @@ Analyzes eye contact, posture, gestures, and expressions
 """
 import cv2
 import numpy as np
-import mediapipe as mp
-from typing import Dict, Any, Tuple, Optional
+from collections import namedtuple
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Sequence, Set, Tuple, Optional
 import base64
 import math
+import struct
+import threading
+import time
+
+from services.vision_engines import DEFAULT_PROFILE, create_engine
+
+
+# cv2.imread flags that let libjpeg decode straight to a reduced size
+REDUCED_DECODE_FLAGS = {
+    1: cv2.IMREAD_COLOR,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8
+}
+
+# Landmark stages in the order they run (pose first: it gates the other two)
+STAGES = ('pose', 'face', 'hands')
+
+# Stages the cascade can gate off or crop to a region of interest
+CASCADE_STAGES = ('face', 'hands')
+
+# Side-by-side engine comparison counters (latency in ms, drift as summed absolute differences)
+COMPARE_COUNTERS = (
+    'compare_frames',
+    'compare_primary_ms',
+    'compare_shadow_ms',
+    'compare_face_mismatch',
+    'compare_drift_gaze_score',
+    'compare_drift_posture_score',
+    'compare_drift_confidence_level',
+    'compare_drift_engagement_score',
+    'compare_drift_gesture_count'
+)
+
+# Pose landmark indices (same in mp.solutions.pose and the Tasks PoseLandmarker)
+POSE_NOSE = 0
+POSE_LEFT_SHOULDER = 11
+POSE_RIGHT_SHOULDER = 12
+POSE_LEFT_WRIST = 15
+POSE_RIGHT_WRIST = 16
+POSE_LEFT_HIP = 23
+POSE_RIGHT_HIP = 24
+
+# Face mesh size with iris refinement (468 mesh points + 10 iris points)
+FACE_REFINED_LANDMARKS = 478
+
+# Cascade tuning: pose points below this visibility count as off-screen, the
+# face crop adds this fraction of the last face box on each side, and crops
+# covering more than ROI_MAX_AREA of the frame just run on the full frame
+ROI_MIN_VISIBILITY = 0.5
+ROI_FACE_MARGIN = 0.5
+ROI_MIN_HAND_MARGIN = 0.1
+ROI_MAX_AREA = 0.6
+ROI_MIN_SIZE = 48
+
+# Landmark mapped from a crop back to full-frame normalized coordinates
+RoiLandmark = namedtuple('RoiLandmark', ['x', 'y', 'z'])
+
+# JPEG start-of-frame markers (carry the image dimensions)
+_JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def peek_image_size(data: bytes) -> Optional[Tuple[int, int]]:
+    """
+    Read (width, height) from a JPEG or PNG header without decoding pixels
+    
+    Args:
+        data: Encoded image bytes
+        
+    Returns:
+        (width, height) or None if the format is not recognized
+    """
+    view = memoryview(data)
+    
+    if bytes(view[:8]) == b'\x89PNG\r\n\x1a\n' and len(view) >= 24:
+        return struct.unpack('>II', view[16:24])
+    
+    if bytes(view[:2]) != b'\xff\xd8':
+        return None
+    
+    i = 2
+    while i + 9 < len(view):
+        if view[i] != 0xFF:
+            return None
+        marker = view[i + 1]
+        if marker == 0xFF:
+            # Fill byte
+            i += 1
+            continue
+        if marker in _JPEG_SOF_MARKERS:
+            height, width = struct.unpack('>HH', view[i + 5:i + 9])
+            return width, height
+        if marker == 0x01 or 0xD0 <= marker <= 0xD9:
+            # Standalone marker without a length field
+            i += 2
+            continue
+        segment_length = struct.unpack('>H', view[i + 2:i + 4])[0]
+        i += 2 + segment_length
+    
+    return None
+
+
+@dataclass
+class FrameLandmarks:
+    """
+    Landmarks produced by one pass of each MediaPipe graph over a frame
+
+    Each entry is an indexable sequence of points with normalized `x`/`y`
+    coordinates, shared by every metric extractor for that frame.
+    """
+    face: Optional[Sequence[Any]] = None
+    pose: Optional[Sequence[Any]] = None
+    hands: List[Sequence[Any]] = field(default_factory=list)
+    
+    # Stages whose landmarks were carried forward from an earlier frame
+    carried: Set[str] = field(default_factory=set)
 
 
 class VisionAnalyzer:
@@ -15,45 +132,138 @@ class VisionAnalyzer:
     Analyzes video frames for interview performance metrics using MediaPipe
     """
     
-    def __init__(self):
-        # Initialize MediaPipe solutions
-        self.mp_face_mesh = mp.solutions.face_mesh
-        self.mp_pose = mp.solutions.pose
-        self.mp_hands = mp.solutions.hands
-        
-        # Initialize detectors
-        self.face_mesh = self.mp_face_mesh.FaceMesh(
-            max_num_faces=1,
-            refine_landmarks=True,
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5
-        )
+    def __init__(
+        self,
+        target_long_edge: int = 640,
+        min_long_edge: int = 320,
+        low_res_load: float = 0.5,
+        duplicate_threshold: float = 3.0,
+        duplicate_max_reuse: int = 15,
+        stage_cadence: Optional[Dict[str, int]] = None,
+        engine: str = 'solutions',
+        engine_options: Optional[Dict[str, Any]] = None,
+        compare_engine: Optional[str] = None,
+        compare_engine_options: Optional[Dict[str, Any]] = None,
+        cascade: bool = False,
+        profile: str = DEFAULT_PROFILE
+    ):
+        # Analysis resolution: frames are decoded/resized so their long edge is
+        # about `target_long_edge` (0 disables), halved when load >= `low_res_load`
+        self.target_long_edge = target_long_edge
+        self.min_long_edge = min_long_edge
+        self.low_res_load = low_res_load
         
-        self.pose = self.mp_pose.Pose(
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5
-        )
+        # Near-duplicate skipping: if a frame's 32x32 grayscale thumbnail differs
+        # from the last analyzed one by less than `duplicate_threshold` (mean
+        # absolute difference, 0-255; 0 disables), reuse the previous landmarks,
+        # at most `duplicate_max_reuse` times in a row
+        self.duplicate_threshold = duplicate_threshold
+        self.duplicate_max_reuse = duplicate_max_reuse
+        
+        # Run each stage every Nth analyzed frame; skipped stages carry forward
+        # their last landmarks (posture and hands change slower than gaze)
+        cadence = {'face': 1, 'pose': 1, 'hands': 1}
+        cadence.update(stage_cadence or {})
+        self.stage_cadence = {stage: max(1, int(cadence[stage])) for stage in STAGES}
         
-        self.hands = self.mp_hands.Hands(
-            max_num_hands=2,
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5
+        # Cascade: pose wrists/nose decide whether Hands/FaceMesh run at all, and
+        # the previous face box and the wrists crop the region they search
+        # (full frame whenever there is nothing to track from)
+        self.cascade = cascade
+        
+        # Landmark engine (owns the MediaPipe graphs), built for an analysis profile
+        self.profile = profile
+        self.engine = create_engine(engine, profile=profile, **(engine_options or {}))
+        
+        # Optional shadow engine run on the same frames to measure latency and metric drift
+        self.compare_engine = (
+            create_engine(compare_engine, profile=profile, **(compare_engine_options or {}))
+            if compare_engine else None
         )
         
+        # Serializes frames of the same session when analysis runs on threads
+        self.lock = threading.Lock()
+        
+        # Lifetime counters (kept across sessions)
+        self.stats = {
+            'frames': 0,
+            'duplicate_frames': 0
+        }
+        for stage in STAGES:
+            self.stats[f'{stage}_runs'] = 0
+            self.stats[f'{stage}_carried'] = 0
+        for stage in CASCADE_STAGES:
+            self.stats[f'{stage}_gated'] = 0
+            self.stats[f'{stage}_cropped'] = 0
+            self.stats[f'{stage}_roi_misses'] = 0
+        if self.compare_engine is not None:
+            for key in COMPARE_COUNTERS:
+                self.stats[key] = 0
+        
         # Tracking state
+        self.reset()
+    
+    def reset(self):
+        """
+        Clear per-session tracking state so the analyzer can serve a new session
+        """
         self.previous_hand_positions = []
         self.looking_away_start = None
         self.looking_away_duration = 0.0
+        
+        # Last frame that went through inference
+        self._last_thumbnail = None
+        self._last_landmarks = None
+        self._reuse_streak = 0
+        
+        # Per-stage scheduler state
+        self._stage_ticks = {stage: 0 for stage in STAGES}
+        self._last_gestures = None
+        
+        # Cascade crops, kept while the target stays inside them
+        self._rois: Dict[str, Optional[Tuple[int, int, int, int]]] = {stage: None for stage in CASCADE_STAGES}
+        # Image each graph saw last (None = full frame)
+        self._fed_rois: Dict[str, Optional[Tuple[int, int, int, int]]] = {stage: None for stage in CASCADE_STAGES}
+        
+        self.engine.reset()
+        if self.compare_engine is not None:
+            self.compare_engine.reset()
+    
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Lifetime frame counters for this analyzer
+        """
+        return dict(self.stats)
+    
+    @staticmethod
+    def summarize_stats(counters: Dict[str, int]) -> Dict[str, Any]:
+        """
+        Add derived ratios to (possibly merged) analyzer counters
+        """
+        frames = counters.get('frames', 0)
+        summary = dict(counters)
+        summary['duplicate_skip_ratio'] = counters.get('duplicate_frames', 0) / frames if frames else 0.0
+        for stage in STAGES:
+            summary[f'{stage}_run_ratio'] = counters.get(f'{stage}_runs', 0) / frames if frames else 0.0
+        for stage in CASCADE_STAGES:
+            summary[f'{stage}_gated_ratio'] = counters.get(f'{stage}_gated', 0) / frames if frames else 0.0
+        
+        compared = counters.get('compare_frames', 0)
+        if compared:
+            for key in COMPARE_COUNTERS[1:]:
+                summary[f'{key}_avg'] = counters[key] / compared
+        return summary
     
-    def decode_frame(self, frame_base64: str) -> Optional[np.ndarray]:
+    def decode_frame(self, frame_base64: str, load: float = 0.0) -> Tuple[Optional[np.ndarray], float]:
         """
         Decode base64 frame to numpy array
         
         Args:
             frame_base64: Base64 encoded image
+            load: Current server load (0-1), used to pick the analysis resolution
             
         Returns:
-            Decoded image as numpy array or None if failed
+            (decoded image or None if failed, scale relative to the original size)
         """
         try:
             # Remove data URL prefix if present
@@ -62,38 +272,163 @@ class VisionAnalyzer:
             
             # Decode base64
             img_data = base64.b64decode(frame_base64)
-            nparr = np.frombuffer(img_data, np.uint8)
-            frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+        except Exception as e:
+            print(f"Error decoding frame: {e}")
+            return None, 1.0
+        
+        return self.decode_frame_bytes(img_data, load)
+    
+    def decode_frame_bytes(self, frame_bytes: bytes, load: float = 0.0) -> Tuple[Optional[np.ndarray], float]:
+        """
+        Decode raw encoded image bytes (e.g. JPEG) at the analysis resolution
+        
+        Large JPEGs are decoded directly at 1/2, 1/4 or 1/8 size, then resized
+        down to the target long edge if still too big. Landmarks are normalized,
+        so metrics do not depend on the resolution.
+        
+        Args:
+            frame_bytes: Encoded image; any buffer-protocol object is read without copying
+            load: Current server load (0-1)
+            
+        Returns:
+            (decoded image or None if failed, scale relative to the original size)
+        """
+        try:
+            nparr = np.frombuffer(frame_bytes, np.uint8)
+            original_size = peek_image_size(frame_bytes)
+            target = self._target_long_edge(load)
             
-            return frame
+            reduction = 1
+            if original_size and target:
+                original_long_edge = max(original_size)
+                while reduction < 8 and original_long_edge / (reduction * 2) >= target:
+                    reduction *= 2
+            
+            frame = cv2.imdecode(nparr, REDUCED_DECODE_FLAGS[reduction])
+            if frame is None:
+                return None, 1.0
+            
+            h, w = frame.shape[:2]
+            original_long_edge = max(original_size) if original_size else max(h, w)
+            
+            if target and max(h, w) > target:
+                factor = target / max(h, w)
+                frame = cv2.resize(
+                    frame,
+                    (max(1, round(w * factor)), max(1, round(h * factor))),
+                    interpolation=cv2.INTER_AREA
+                )
+            
+            return frame, max(frame.shape[:2]) / original_long_edge
         except Exception as e:
             print(f"Error decoding frame: {e}")
-            return None
+            return None, 1.0
     
-    def analyze_frame(self, frame_base64: str, timestamp: float) -> Dict[str, Any]:
+    def analyze_frame(self, frame_base64: str, timestamp: float, load: float = 0.0) -> Dict[str, Any]:
         """
         Analyze a single frame for all metrics
         
         Args:
             frame_base64: Base64 encoded frame
             timestamp: Timestamp of the frame
+            load: Current server load (0-1)
+            
+        Returns:
+            Dictionary containing all analysis results
+        """
+        frame, scale = self.decode_frame(frame_base64, load)
+        return self.analyze_image(frame, timestamp, scale)
+    
+    def analyze_frame_bytes(self, frame_bytes: bytes, timestamp: float, load: float = 0.0) -> Dict[str, Any]:
+        """
+        Analyze a single frame sent as raw encoded image bytes
+        
+        Args:
+            frame_bytes: Encoded image (JPEG/PNG/WebP)
+            timestamp: Timestamp of the frame
+            load: Current server load (0-1)
             
         Returns:
             Dictionary containing all analysis results
         """
-        frame = self.decode_frame(frame_base64)
+        frame, scale = self.decode_frame_bytes(frame_bytes, load)
+        return self.analyze_image(frame, timestamp, scale)
+    
+    def analyze_frames(self, frames: List[Tuple[str, float]], load: float = 0.0) -> List[Dict[str, Any]]:
+        """
+        Analyze an ordered batch of frames from one session
+        
+        Frames are decoded up front, then run through the models in timestamp
+        order so gaze and fidgeting tracking see them in sequence.
+        
+        Args:
+            frames: List of (base64 frame, timestamp) pairs
+            load: Current server load (0-1)
+            
+        Returns:
+            List of analysis results sorted by timestamp
+        """
+        decoded = [
+            (timestamp, self.decode_frame(frame_base64, load))
+            for frame_base64, timestamp in frames
+        ]
+        decoded.sort(key=lambda item: item[0])
+        
+        return [
+            self.analyze_image(frame, timestamp, scale)
+            for timestamp, (frame, scale) in decoded
+        ]
+    
+    def analyze_image(self, frame: Optional[np.ndarray], timestamp: float, scale: float = 1.0) -> Dict[str, Any]:
+        """
+        Analyze a decoded BGR frame for all metrics
         
+        Args:
+            frame: Decoded BGR image, or None if decoding failed
+            timestamp: Timestamp of the frame
+            scale: Analysis resolution relative to the uploaded frame
+            
+        Returns:
+            Dictionary containing all analysis results
+        """
         if frame is None:
             return self._get_default_metrics(timestamp)
         
-        # Convert BGR to RGB for MediaPipe
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        self.stats['frames'] += 1
+        thumbnail = self._thumbnail(frame) if self.duplicate_threshold > 0 else None
+        
+        if self._is_near_duplicate(thumbnail):
+            # Candidate hasn't moved: reuse landmarks, but still run the extractors
+            # below so time-based state (looking-away duration) keeps advancing
+            landmarks = self._last_landmarks
+            self._reuse_streak += 1
+            self.stats['duplicate_frames'] += 1
+        else:
+            # Convert BGR to RGB for MediaPipe
+            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            
+            # Run each graph once and share the landmarks between extractors
+            started = time.perf_counter()
+            landmarks = self._detect_landmarks(rgb_frame, timestamp)
+            primary_ms = (time.perf_counter() - started) * 1000
+            
+            if self.compare_engine is not None:
+                self._compare_engines(rgb_frame, timestamp, landmarks, primary_ms)
+            
+            self._last_thumbnail = thumbnail
+            self._last_landmarks = landmarks
+            self._reuse_streak = 0
         
         # Analyze different aspects
-        eye_contact = self._analyze_eye_contact(rgb_frame, timestamp)
-        posture = self._analyze_posture(rgb_frame)
-        gestures = self._analyze_gestures(rgb_frame)
-        expressions = self._analyze_expressions(rgb_frame)
+        eye_contact = self._analyze_eye_contact(landmarks, timestamp)
+        posture = self._analyze_posture(landmarks)
+        if 'hands' in landmarks.carried and self._last_gestures is not None:
+            # Fidgeting is movement between fresh hand detections, so carry it too
+            gestures = dict(self._last_gestures)
+        else:
+            gestures = self._analyze_gestures(landmarks)
+            self._last_gestures = gestures
+        expressions = self._analyze_expressions(landmarks)
         
         # Calculate overall confidence
         overall_confidence = self._calculate_frame_confidence(
@@ -106,52 +441,374 @@ class VisionAnalyzer:
             'gestures': gestures,
             'expressions': expressions,
             'overall_confidence': overall_confidence,
-            'timestamp': timestamp
+            'timestamp': timestamp,
+            'analysis_scale': float(scale)
         }
     
-    def _analyze_eye_contact(self, frame: np.ndarray, timestamp: float) -> Dict[str, Any]:
+    @staticmethod
+    def _thumbnail(frame: np.ndarray) -> np.ndarray:
         """
-        Analyze eye contact and gaze direction using face mesh
+        Tiny grayscale version of a frame for cheap change detection
+        """
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        return cv2.resize(gray, (32, 32), interpolation=cv2.INTER_AREA)
+    
+    def _is_near_duplicate(self, thumbnail: Optional[np.ndarray]) -> bool:
+        """
+        Whether a frame is close enough to the last analyzed one to skip inference
+        """
+        if thumbnail is None or self._last_thumbnail is None or self._last_landmarks is None:
+            return False
+        if self._reuse_streak >= self.duplicate_max_reuse:
+            return False
+        difference = float(cv2.absdiff(thumbnail, self._last_thumbnail).mean())
+        return difference < self.duplicate_threshold
+    
+    def _target_long_edge(self, load: float) -> int:
+        """
+        Long edge to analyze at for the current load (0 = full resolution)
         """
-        results = self.face_mesh.process(frame)
+        if self.target_long_edge <= 0:
+            return 0
+        if load >= self.low_res_load:
+            return max(self.min_long_edge, self.target_long_edge // 2)
+        return self.target_long_edge
+    
+    def _detect_landmarks(self, frame: np.ndarray, timestamp: float) -> FrameLandmarks:
+        """
+        Run the landmark stages due on this frame (each at most once) on an RGB
+        frame, carrying forward the previous result for stages that are skipped
+        """
+        if self.engine.single_pass:
+            face, pose, hands = self.engine.detect_all(frame, timestamp)
+            for stage in STAGES:
+                self.stats[f'{stage}_runs'] += 1
+            return FrameLandmarks(face=face, pose=pose, hands=hands)
         
-        if not results.multi_face_landmarks:
-            if self.looking_away_start is None:
-                self.looking_away_start = timestamp
-            self.looking_away_duration = timestamp - self.looking_away_start
+        previous = self._last_landmarks
+        landmarks = FrameLandmarks()
+        
+        for stage in STAGES:
+            due = self._stage_ticks[stage] % self.stage_cadence[stage] == 0
+            self._stage_ticks[stage] += 1
             
-            return {
-                'is_looking_at_camera': False,
-                'gaze_score': 0.0,
-                'looking_away_duration': self.looking_away_duration
-            }
+            if due or previous is None:
+                pose_fresh = 'pose' not in landmarks.carried
+                setattr(landmarks, stage, self._run_due_stage(
+                    stage, frame, timestamp, landmarks.pose, pose_fresh, previous
+                ))
+            else:
+                self.stats[f'{stage}_carried'] += 1
+                setattr(landmarks, stage, getattr(previous, stage))
+                landmarks.carried.add(stage)
+        
+        return landmarks
+    
+    def _compare_engines(
+        self,
+        frame: np.ndarray,
+        timestamp: float,
+        primary: FrameLandmarks,
+        primary_ms: float
+    ) -> None:
+        """
+        Run the shadow engine on the same frame and record latency and metric drift
+        
+        Only stateless metrics are compared, so the session's tracking state
+        (looking-away timer, previous hand positions) is left untouched.
+        """
+        engine = self.compare_engine
+        started = time.perf_counter()
+        if engine.single_pass:
+            face, pose, hands = engine.detect_all(frame, timestamp)
+        else:
+            face = engine.detect_face(frame, timestamp)
+            pose = engine.detect_pose(frame, timestamp)
+            hands = engine.detect_hands(frame, timestamp)
+        shadow_ms = (time.perf_counter() - started) * 1000
+        shadow = FrameLandmarks(face=face, pose=pose, hands=hands)
+        
+        primary_expressions = self._analyze_expressions(primary)
+        shadow_expressions = self._analyze_expressions(shadow)
+        
+        self.stats['compare_frames'] += 1
+        self.stats['compare_primary_ms'] += primary_ms
+        self.stats['compare_shadow_ms'] += shadow_ms
+        self.stats['compare_face_mismatch'] += int((primary.face is None) != (shadow.face is None))
+        self.stats['compare_drift_gaze_score'] += abs(
+            self._gaze_score(primary.face) - self._gaze_score(shadow.face)
+        )
+        self.stats['compare_drift_posture_score'] += abs(
+            self._analyze_posture(primary)['posture_score'] - self._analyze_posture(shadow)['posture_score']
+        )
+        self.stats['compare_drift_confidence_level'] += abs(
+            primary_expressions['confidence_level'] - shadow_expressions['confidence_level']
+        )
+        self.stats['compare_drift_engagement_score'] += abs(
+            primary_expressions['engagement_score'] - shadow_expressions['engagement_score']
+        )
+        self.stats['compare_drift_gesture_count'] += abs(len(primary.hands) - len(shadow.hands))
+    
+    def _run_due_stage(
+        self,
+        stage: str,
+        frame: np.ndarray,
+        timestamp: float,
+        pose: Optional[Sequence[Any]],
+        pose_fresh: bool,
+        previous: Optional[FrameLandmarks]
+    ) -> Any:
+        """
+        Run a stage that is due on this frame, through the cascade if enabled
+        
+        Only a pose detected on this frame (`pose_fresh`) can gate a stage off;
+        a crop placed from a carried pose falls back to the full frame on a miss.
+        The graphs track landmarks between calls in the coordinates they were
+        last fed, so a new crop is only used when there is no track to lose;
+        a tracked stage keeps its current crop or the full frame.
+        """
+        if not self.cascade or stage not in CASCADE_STAGES:
+            self.stats[f'{stage}_runs'] += 1
+            return self._run_stage(stage, frame, timestamp)
+        
+        if pose_fresh and self._gated_off(stage, pose):
+            self.stats[f'{stage}_gated'] += 1
+            return None if stage == 'face' else []
+        
+        self.stats[f'{stage}_runs'] += 1
+        roi = self._stage_roi(stage, frame.shape, pose, previous)
+        if roi != self._fed_rois[stage] and self._found(getattr(previous, stage, None)):
+            roi = None
+        if roi is None:
+            self._fed_rois[stage] = None
+            return self._run_stage(stage, frame, timestamp)
+        
+        self.stats[f'{stage}_cropped'] += 1
+        x0, y0, x1, y1 = roi
+        crop = frame[y0:y1, x0:x1]
+        result = self._run_stage(stage, crop, timestamp)
+        self._fed_rois[stage] = roi
+        
+        if self._found(result):
+            if stage == 'face':
+                return self._remap_landmarks(result, roi, frame.shape)
+            return [self._remap_landmarks(hand, roi, frame.shape) for hand in result]
+        
+        self.stats[f'{stage}_roi_misses'] += 1
+        self._rois[stage] = None
+        if stage == 'hands' and pose_fresh:
+            # The crop holds this frame's wrists, so there is nothing elsewhere
+            return []
+        
+        # The crop came from an earlier frame (previous face, carried pose):
+        # search the whole frame again
+        self._fed_rois[stage] = None
+        return self._run_stage(stage, frame, timestamp)
+    
+    @staticmethod
+    def _found(landmarks: Any) -> bool:
+        return landmarks is not None and len(landmarks) > 0
+    
+    @staticmethod
+    def _is_visible(point: Any) -> bool:
+        """
+        Whether a pose point is inside the frame and confidently visible
+        """
+        visibility = getattr(point, 'visibility', None)
+        if visibility is not None and visibility < ROI_MIN_VISIBILITY:
+            return False
+        return 0.0 <= point.x <= 1.0 and 0.0 <= point.y <= 1.0
+    
+    def _gated_off(self, stage: str, pose: Optional[Sequence[Any]]) -> bool:
+        """
+        Whether the pose says a stage has nothing to find (no pose = no opinion)
+        """
+        if pose is None:
+            return False
+        if stage == 'face':
+            return not self._is_visible(pose[POSE_NOSE])
+        return not (self._is_visible(pose[POSE_LEFT_WRIST]) or self._is_visible(pose[POSE_RIGHT_WRIST]))
+    
+    def _stage_roi(
+        self,
+        stage: str,
+        shape: Tuple[int, ...],
+        pose: Optional[Sequence[Any]],
+        previous: Optional[FrameLandmarks]
+    ) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Pixel crop (x0, y0, x1, y1) for a stage, or None to search the full frame
         
-        face_landmarks = results.multi_face_landmarks[0]
+        The crop is kept as long as the tracked points stay well inside it: the
+        graphs track landmarks between calls, and a crop that moves every frame
+        would throw that tracking away.
+        """
+        height, width = shape[:2]
+        points = self._roi_points(stage, pose, previous, shape)
+        if points is None:
+            self._rois[stage] = None
+            return None
+        xs, ys, margin = points
         
-        # Get eye landmarks (left eye: 468, right eye: 473)
-        # Iris landmarks for gaze estimation
-        h, w = frame.shape[:2]
+        roi = self._rois[stage]
+        if roi is not None:
+            x0, y0, x1, y1 = roi
+            inset = margin / 2
+            if (
+                xs.min() * width >= x0 + inset and xs.max() * width <= x1 - inset and
+                ys.min() * height >= y0 + inset and ys.max() * height <= y1 - inset
+            ):
+                return roi
         
-        # Left eye center (approximate)
-        left_eye_x = face_landmarks.landmark[468].x
-        left_eye_y = face_landmarks.landmark[468].y
+        self._rois[stage] = self._crop_box(xs, ys, margin, width, height)
+        return self._rois[stage]
+    
+    def _roi_points(
+        self,
+        stage: str,
+        pose: Optional[Sequence[Any]],
+        previous: Optional[FrameLandmarks],
+        shape: Tuple[int, ...]
+    ) -> Optional[Tuple[np.ndarray, np.ndarray, float]]:
+        """
+        Normalized points a stage's crop must contain, and the pixel margin around them
+        """
+        height, width = shape[:2]
         
-        # Right eye center (approximate)
-        right_eye_x = face_landmarks.landmark[473].x
-        right_eye_y = face_landmarks.landmark[473].y
+        if stage == 'face':
+            # Around the last face box
+            if previous is None or previous.face is None:
+                return None
+            xs = np.fromiter((point.x for point in previous.face), dtype=np.float64)
+            ys = np.fromiter((point.y for point in previous.face), dtype=np.float64)
+            box_size = max((xs.max() - xs.min()) * width, (ys.max() - ys.min()) * height)
+            return xs, ys, ROI_FACE_MARGIN * box_size
+        
+        # Hands: around the visible wrists (and last hands), with about a
+        # shoulder width of room for the fingers
+        if pose is None:
+            return None
+        points = [
+            (pose[index].x, pose[index].y)
+            for index in (POSE_LEFT_WRIST, POSE_RIGHT_WRIST)
+            if self._is_visible(pose[index])
+        ]
+        if previous is not None:
+            points.extend((hand[0].x, hand[0].y) for hand in previous.hands)
+        if not points:
+            # Nothing to place a crop around (only a carried pose gets here;
+            # a fresh one without wrists gates the stage off)
+            return None
+        
+        left_shoulder = pose[POSE_LEFT_SHOULDER]
+        right_shoulder = pose[POSE_RIGHT_SHOULDER]
+        shoulder_width = math.hypot(
+            (left_shoulder.x - right_shoulder.x) * width,
+            (left_shoulder.y - right_shoulder.y) * height
+        )
+        margin = max(shoulder_width, ROI_MIN_HAND_MARGIN * max(width, height))
+        xs, ys = np.array(points, dtype=np.float64).T
+        return xs, ys, margin
+    
+    @staticmethod
+    def _crop_box(
+        xs: np.ndarray,
+        ys: np.ndarray,
+        margin: float,
+        width: int,
+        height: int
+    ) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Pixel box around normalized points plus a margin, clipped to the frame
+        
+        Returns:
+            (x0, y0, x1, y1), or None if the box is degenerate or nearly the whole frame
+        """
+        x0 = max(0, int(xs.min() * width - margin))
+        y0 = max(0, int(ys.min() * height - margin))
+        x1 = min(width, int(math.ceil(xs.max() * width + margin)))
+        y1 = min(height, int(math.ceil(ys.max() * height + margin)))
+        
+        if x1 - x0 < ROI_MIN_SIZE or y1 - y0 < ROI_MIN_SIZE:
+            return None
+        if (x1 - x0) * (y1 - y0) > ROI_MAX_AREA * width * height:
+            return None
+        return x0, y0, x1, y1
+    
+    @staticmethod
+    def _remap_landmarks(
+        landmarks: Sequence[Any],
+        roi: Tuple[int, int, int, int],
+        shape: Tuple[int, ...]
+    ) -> List[RoiLandmark]:
+        """
+        Map landmarks found in a crop back to full-frame normalized coordinates
+        """
+        height, width = shape[:2]
+        x0, y0, x1, y1 = roi
+        scale_x = (x1 - x0) / width
+        scale_y = (y1 - y0) / height
+        offset_x = x0 / width
+        offset_y = y0 / height
+        return [
+            RoiLandmark(offset_x + point.x * scale_x, offset_y + point.y * scale_y, point.z * scale_x)
+            for point in landmarks
+        ]
+    
+    def _run_stage(self, stage: str, frame: np.ndarray, timestamp: float) -> Any:
+        """
+        Run one landmark stage on the engine and return it in FrameLandmarks form
+        """
+        if stage == 'face':
+            return self.engine.detect_face(frame, timestamp)
+        if stage == 'pose':
+            return self.engine.detect_pose(frame, timestamp)
+        return self.engine.detect_hands(frame, timestamp)
+    
+    @staticmethod
+    def _gaze_score(face_landmarks: Optional[Sequence[Any]]) -> float:
+        """
+        Gaze score from face landmarks: 1.0 = looking directly, 0.0 = looking away
+        """
+        if face_landmarks is None:
+            return 0.0
         
-        # Face center
-        nose_tip = face_landmarks.landmark[1]
-        face_center_x = nose_tip.x
-        face_center_y = nose_tip.y
+        if len(face_landmarks) >= FACE_REFINED_LANDMARKS:
+            # Iris landmarks for gaze estimation (left eye: 468, right eye: 473)
+            left_eye_x = face_landmarks[468].x
+            left_eye_y = face_landmarks[468].y
+            right_eye_x = face_landmarks[473].x
+            right_eye_y = face_landmarks[473].y
+        else:
+            # No iris points (unrefined mesh): use the midpoint of each eye's corners
+            left_eye_x = (face_landmarks[33].x + face_landmarks[133].x) / 2
+            left_eye_y = (face_landmarks[33].y + face_landmarks[133].y) / 2
+            right_eye_x = (face_landmarks[362].x + face_landmarks[263].x) / 2
+            right_eye_y = (face_landmarks[362].y + face_landmarks[263].y) / 2
         
         # Calculate gaze direction (simplified)
         # In a real scenario, looking at camera means eyes are centered
         gaze_offset_x = abs((left_eye_x + right_eye_x) / 2 - 0.5)
         gaze_offset_y = abs((left_eye_y + right_eye_y) / 2 - 0.5)
         
-        # Gaze score: 1.0 = looking directly, 0.0 = looking away
-        gaze_score = max(0, 1.0 - (gaze_offset_x * 2 + gaze_offset_y * 2))
+        return max(0, 1.0 - (gaze_offset_x * 2 + gaze_offset_y * 2))
+    
+    def _analyze_eye_contact(self, landmarks: FrameLandmarks, timestamp: float) -> Dict[str, Any]:
+        """
+        Analyze eye contact and gaze direction using face mesh
+        """
+        if landmarks.face is None:
+            if self.looking_away_start is None:
+                self.looking_away_start = timestamp
+            self.looking_away_duration = timestamp - self.looking_away_start
+            
+            return {
+                'is_looking_at_camera': False,
+                'gaze_score': 0.0,
+                'looking_away_duration': self.looking_away_duration
+            }
+        
+        gaze_score = self._gaze_score(landmarks.face)
         
         is_looking_at_camera = gaze_score > 0.6
         
@@ -169,13 +826,11 @@ class VisionAnalyzer:
             'looking_away_duration': self.looking_away_duration
         }
     
-    def _analyze_posture(self, frame: np.ndarray) -> Dict[str, Any]:
+    def _analyze_posture(self, landmarks: FrameLandmarks) -> Dict[str, Any]:
         """
         Analyze body posture using pose detection
         """
-        results = self.pose.process(frame)
-        
-        if not results.pose_landmarks:
+        if landmarks.pose is None:
             return {
                 'is_upright': True,
                 'posture_score': 0.5,
@@ -183,16 +838,16 @@ class VisionAnalyzer:
                 'shoulder_alignment': 0.5
             }
         
-        landmarks = results.pose_landmarks.landmark
+        pose_landmarks = landmarks.pose
         
         # Get shoulder landmarks
-        left_shoulder = landmarks[self.mp_pose.PoseLandmark.LEFT_SHOULDER]
-        right_shoulder = landmarks[self.mp_pose.PoseLandmark.RIGHT_SHOULDER]
+        left_shoulder = pose_landmarks[POSE_LEFT_SHOULDER]
+        right_shoulder = pose_landmarks[POSE_RIGHT_SHOULDER]
         
         # Get nose and hip for posture analysis
-        nose = landmarks[self.mp_pose.PoseLandmark.NOSE]
-        left_hip = landmarks[self.mp_pose.PoseLandmark.LEFT_HIP]
-        right_hip = landmarks[self.mp_pose.PoseLandmark.RIGHT_HIP]
+        nose = pose_landmarks[POSE_NOSE]
+        left_hip = pose_landmarks[POSE_LEFT_HIP]
+        right_hip = pose_landmarks[POSE_RIGHT_HIP]
         
         # Calculate shoulder alignment (should be horizontal)
         shoulder_slope = abs(left_shoulder.y - right_shoulder.y)
@@ -222,13 +877,11 @@ class VisionAnalyzer:
             'shoulder_alignment': float(shoulder_alignment)
         }
     
-    def _analyze_gestures(self, frame: np.ndarray) -> Dict[str, Any]:
+    def _analyze_gestures(self, landmarks: FrameLandmarks) -> Dict[str, Any]:
         """
         Analyze hand gestures and fidgeting
         """
-        results = self.hands.process(frame)
-        
-        if not results.multi_hand_landmarks:
+        if not landmarks.hands:
             self.previous_hand_positions = []
             return {
                 'hand_detected': False,
@@ -238,13 +891,13 @@ class VisionAnalyzer:
             }
         
         hand_positions = []
-        gesture_count = len(results.multi_hand_landmarks)
+        gesture_count = len(landmarks.hands)
         
         # Track hand positions for fidgeting detection
         current_positions = []
-        for hand_landmarks in results.multi_hand_landmarks:
+        for hand_landmarks in landmarks.hands:
             # Use wrist position as reference
-            wrist = hand_landmarks.landmark[0]
+            wrist = hand_landmarks[0]
             current_positions.append((wrist.x, wrist.y))
             
             # Determine hand position (simplified)
@@ -273,13 +926,11 @@ class VisionAnalyzer:
             'hand_positions': hand_positions
         }
     
-    def _analyze_expressions(self, frame: np.ndarray) -> Dict[str, Any]:
+    def _analyze_expressions(self, landmarks: FrameLandmarks) -> Dict[str, Any]:
         """
         Analyze facial expressions for confidence and engagement
         """
-        results = self.face_mesh.process(frame)
-        
-        if not results.multi_face_landmarks:
+        if landmarks.face is None:
             return {
                 'confidence_level': 0.5,
                 'smile_detected': False,
@@ -287,14 +938,14 @@ class VisionAnalyzer:
                 'engagement_score': 0.5
             }
         
-        face_landmarks = results.multi_face_landmarks[0]
+        face_landmarks = landmarks.face
         
         # Mouth landmarks for smile detection
         # Upper lip: 13, Lower lip: 14, Left corner: 61, Right corner: 291
-        upper_lip = face_landmarks.landmark[13]
-        lower_lip = face_landmarks.landmark[14]
-        left_corner = face_landmarks.landmark[61]
-        right_corner = face_landmarks.landmark[291]
+        upper_lip = face_landmarks[13]
+        lower_lip = face_landmarks[14]
+        left_corner = face_landmarks[61]
+        right_corner = face_landmarks[291]
         
         # Calculate mouth opening
         mouth_opening = abs(upper_lip.y - lower_lip.y)
@@ -307,8 +958,8 @@ class VisionAnalyzer:
         
         # Eyebrow position for engagement (simplified)
         # Higher eyebrows often indicate engagement
-        left_eyebrow = face_landmarks.landmark[70]
-        right_eyebrow = face_landmarks.landmark[300]
+        left_eyebrow = face_landmarks[70]
+        right_eyebrow = face_landmarks[300]
         eyebrow_height = 1.0 - (left_eyebrow.y + right_eyebrow.y) / 2
         
         # Confidence level based on facial features
@@ -402,13 +1053,14 @@ class VisionAnalyzer:
                 'engagement_score': 0.5
             },
             'overall_confidence': 50.0,
-            'timestamp': timestamp
+            'timestamp': timestamp,
+            'analysis_scale': 1.0
         }
     
     def cleanup(self):
         """
         Release resources
         """
-        self.face_mesh.close()
-        self.pose.close()
-        self.hands.close()
+        self.engine.close()
+        if self.compare_engine is not None:
+            self.compare_engine.close()
@@ -0,0 +1,306 @@
+"""
+MediaPipe inference engines for VisionAnalyzer
+Each engine turns an RGB frame into face, pose and hand landmarks, one stage at a time
+"""
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import mediapipe as mp
+
+
+# Analysis profiles: how much landmark accuracy to trade for frames per core.
+# `model_complexity` picks the pose model (0 = lite, 1 = full, 2 = heavy) and
+# `refine_landmarks` adds the iris points to the face mesh.
+PROFILES = {
+    'full': {
+        'refine_landmarks': True,
+        'model_complexity': 1,
+        'max_num_hands': 2,
+        'min_detection_confidence': 0.5,
+        'min_tracking_confidence': 0.5
+    },
+    'balanced': {
+        'refine_landmarks': False,
+        'model_complexity': 1,
+        'max_num_hands': 2,
+        'min_detection_confidence': 0.5,
+        'min_tracking_confidence': 0.5
+    },
+    'lite': {
+        'refine_landmarks': False,
+        'model_complexity': 0,
+        'max_num_hands': 1,
+        'min_detection_confidence': 0.6,
+        'min_tracking_confidence': 0.3
+    }
+}
+DEFAULT_PROFILE = 'full'
+
+
+class SolutionsEngine:
+    """
+    Legacy `mp.solutions` graphs: FaceMesh, Pose and Hands with per-call `process()`
+    """
+
+    name = 'solutions'
+    single_pass = False
+
+    def __init__(
+        self,
+        refine_landmarks: bool = True,
+        model_complexity: int = 1,
+        max_num_hands: int = 2,
+        min_detection_confidence: float = 0.5,
+        min_tracking_confidence: float = 0.5
+    ):
+        self.mp_face_mesh = mp.solutions.face_mesh
+        self.mp_pose = mp.solutions.pose
+        self.mp_hands = mp.solutions.hands
+
+        self.face_mesh = self.mp_face_mesh.FaceMesh(
+            max_num_faces=1,
+            refine_landmarks=refine_landmarks,
+            min_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence
+        )
+
+        self.pose = self.mp_pose.Pose(
+            model_complexity=model_complexity,
+            min_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence
+        )
+
+        self.hands = self.mp_hands.Hands(
+            max_num_hands=max_num_hands,
+            model_complexity=min(model_complexity, 1),
+            min_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence
+        )
+
+    def detect_face(self, frame: np.ndarray, timestamp: float) -> Optional[Sequence[Any]]:
+        results = self.face_mesh.process(frame)
+        return results.multi_face_landmarks[0].landmark if results.multi_face_landmarks else None
+
+    def detect_pose(self, frame: np.ndarray, timestamp: float) -> Optional[Sequence[Any]]:
+        results = self.pose.process(frame)
+        return results.pose_landmarks.landmark if results.pose_landmarks else None
+
+    def detect_hands(self, frame: np.ndarray, timestamp: float) -> List[Sequence[Any]]:
+        results = self.hands.process(frame)
+        if not results.multi_hand_landmarks:
+            return []
+        return [hand.landmark for hand in results.multi_hand_landmarks]
+
+    def reset(self) -> None:
+        """
+        Nothing to do: the solutions graphs re-detect when tracking is lost
+        """
+
+    def close(self) -> None:
+        self.face_mesh.close()
+        self.pose.close()
+        self.hands.close()
+
+
+class TasksEngine:
+    """
+    MediaPipe Tasks landmarkers (FaceLandmarker, PoseLandmarker, HandLandmarker)
+    in VIDEO running mode
+
+    VIDEO mode tracks landmarks between frames using the frame timestamps, so
+    steady-state frames skip the full detector. Model bundles are read from
+    `model_dir` (face_landmarker.task, hand_landmarker.task and the pose bundle
+    for the profile's complexity, e.g. pose_landmarker_full.task). The face
+    landmarker always returns iris points, so `refine_landmarks` has no effect.
+    """
+
+    name = 'tasks'
+    single_pass = False
+
+    FACE_MODEL = 'face_landmarker.task'
+    POSE_MODELS = {
+        0: 'pose_landmarker_lite.task',
+        1: 'pose_landmarker_full.task',
+        2: 'pose_landmarker_heavy.task'
+    }
+    HAND_MODEL = 'hand_landmarker.task'
+
+    def __init__(
+        self,
+        model_dir: str = 'mediapipe_models',
+        refine_landmarks: bool = True,
+        model_complexity: int = 1,
+        max_num_hands: int = 2,
+        min_detection_confidence: float = 0.5,
+        min_tracking_confidence: float = 0.5
+    ):
+        vision = mp.tasks.vision
+        video_mode = vision.RunningMode.VIDEO
+
+        self.face_landmarker = vision.FaceLandmarker.create_from_options(
+            vision.FaceLandmarkerOptions(
+                base_options=self._base_options(model_dir, self.FACE_MODEL),
+                running_mode=video_mode,
+                num_faces=1,
+                min_face_detection_confidence=min_detection_confidence,
+                min_tracking_confidence=min_tracking_confidence
+            )
+        )
+
+        self.pose_landmarker = vision.PoseLandmarker.create_from_options(
+            vision.PoseLandmarkerOptions(
+                base_options=self._base_options(model_dir, self.POSE_MODELS[model_complexity]),
+                running_mode=video_mode,
+                num_poses=1,
+                min_pose_detection_confidence=min_detection_confidence,
+                min_tracking_confidence=min_tracking_confidence
+            )
+        )
+
+        self.hand_landmarker = vision.HandLandmarker.create_from_options(
+            vision.HandLandmarkerOptions(
+                base_options=self._base_options(model_dir, self.HAND_MODEL),
+                running_mode=video_mode,
+                num_hands=max_num_hands,
+                min_hand_detection_confidence=min_detection_confidence,
+                min_tracking_confidence=min_tracking_confidence
+            )
+        )
+
+        # VIDEO mode needs strictly increasing timestamps per landmarker, across sessions too
+        self._last_timestamp_ms: Dict[str, int] = {'face': -1, 'pose': -1, 'hands': -1}
+        self._session_offset_ms = 0
+
+    @staticmethod
+    def _base_options(model_dir: str, filename: str):
+        path = os.path.join(model_dir, filename)
+        if not os.path.exists(path):
+            raise FileNotFoundError(
+                f"MediaPipe Tasks model not found: {path} (set VISION_TASKS_MODEL_DIR)"
+            )
+        return mp.tasks.BaseOptions(model_asset_path=path)
+
+    def _timestamp_ms(self, stage: str, timestamp: float) -> int:
+        timestamp_ms = self._session_offset_ms + int(timestamp * 1000)
+        timestamp_ms = max(timestamp_ms, self._last_timestamp_ms[stage] + 1)
+        self._last_timestamp_ms[stage] = timestamp_ms
+        return timestamp_ms
+
+    @staticmethod
+    def _image(frame: np.ndarray) -> mp.Image:
+        return mp.Image(image_format=mp.ImageFormat.SRGB, data=np.ascontiguousarray(frame))
+
+    def detect_face(self, frame: np.ndarray, timestamp: float) -> Optional[Sequence[Any]]:
+        result = self.face_landmarker.detect_for_video(
+            self._image(frame), self._timestamp_ms('face', timestamp)
+        )
+        return result.face_landmarks[0] if result.face_landmarks else None
+
+    def detect_pose(self, frame: np.ndarray, timestamp: float) -> Optional[Sequence[Any]]:
+        result = self.pose_landmarker.detect_for_video(
+            self._image(frame), self._timestamp_ms('pose', timestamp)
+        )
+        return result.pose_landmarks[0] if result.pose_landmarks else None
+
+    def detect_hands(self, frame: np.ndarray, timestamp: float) -> List[Sequence[Any]]:
+        result = self.hand_landmarker.detect_for_video(
+            self._image(frame), self._timestamp_ms('hands', timestamp)
+        )
+        return list(result.hand_landmarks)
+
+    def reset(self) -> None:
+        """
+        Start a new session's clock after the previous session's last timestamp
+        """
+        self._session_offset_ms = max(self._last_timestamp_ms.values()) + 1
+
+    def close(self) -> None:
+        self.face_landmarker.close()
+        self.pose_landmarker.close()
+        self.hand_landmarker.close()
+
+
+class HolisticEngine:
+    """
+    `mp.solutions.holistic`: face, pose and both hands from one pipeline
+
+    Holistic finds the person once and derives the face and hand regions from
+    the pose, instead of three graphs each running their own detector. It only
+    runs as a whole, so per-stage cadence does not apply. It always looks for
+    both hands, so `max_num_hands` has no effect.
+    """
+
+    name = 'holistic'
+    single_pass = True
+
+    def __init__(
+        self,
+        refine_landmarks: bool = True,
+        model_complexity: int = 1,
+        max_num_hands: int = 2,
+        min_detection_confidence: float = 0.5,
+        min_tracking_confidence: float = 0.5
+    ):
+        self.mp_holistic = mp.solutions.holistic
+        self.holistic = self.mp_holistic.Holistic(
+            model_complexity=model_complexity,
+            refine_face_landmarks=refine_landmarks,
+            min_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence
+        )
+
+    def detect_all(
+        self,
+        frame: np.ndarray,
+        timestamp: float
+    ) -> Tuple[Optional[Sequence[Any]], Optional[Sequence[Any]], List[Sequence[Any]]]:
+        """
+        Run the holistic pipeline once
+
+        Returns:
+            (face landmarks, pose landmarks, list of hand landmarks)
+        """
+        results = self.holistic.process(frame)
+        face = results.face_landmarks.landmark if results.face_landmarks else None
+        pose = results.pose_landmarks.landmark if results.pose_landmarks else None
+        hands = [
+            hand.landmark
+            for hand in (results.left_hand_landmarks, results.right_hand_landmarks)
+            if hand is not None
+        ]
+        return face, pose, hands
+
+    def reset(self) -> None:
+        """
+        Nothing to do: holistic re-detects when tracking is lost
+        """
+
+    def close(self) -> None:
+        self.holistic.close()
+
+
+ENGINES = {
+    SolutionsEngine.name: SolutionsEngine,
+    TasksEngine.name: TasksEngine,
+    HolisticEngine.name: HolisticEngine
+}
+
+
+def create_engine(name: str = 'solutions', profile: str = DEFAULT_PROFILE, **options):
+    """
+    Build a landmark engine by name
+
+    Args:
+        name: One of ENGINES ('solutions', 'tasks', 'holistic')
+        profile: One of PROFILES ('full', 'balanced', 'lite')
+        **options: Engine-specific options (e.g. model_dir for 'tasks'); these
+            override the profile's settings
+    """
+    if name not in ENGINES:
+        raise ValueError(f"Unknown vision engine '{name}' (expected one of {sorted(ENGINES)})")
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown vision profile '{profile}' (expected one of {sorted(PROFILES)})")
+    settings = dict(PROFILES[profile])
+    settings.update(options)
+    return ENGINES[name](**settings)
@@ -0,0 +1,344 @@
+"""
+Vision worker pool
+Runs VisionAnalyzer work off the event loop, either in worker processes that own
+their own MediaPipe graphs or in a background thread inside the API process
+"""
+import asyncio
+import itertools
+import multiprocessing
+import os
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from services.analyzer_pool import VisionAnalyzerPool, DEFAULT_SESSION_ID, merge_counters
+from services.vision_analyzer import VisionAnalyzer
+
+
+class VisionPoolBusy(Exception):
+    """
+    Raised when a worker's queue is full and the frame should be rejected
+    """
+
+
+class VisionWorkerError(Exception):
+    """
+    Raised when a worker fails to run a task
+    """
+
+
+def _run_task(
+    pool: VisionAnalyzerPool,
+    session_id: str,
+    method: str,
+    args: tuple,
+    profile: Optional[str] = None
+) -> Any:
+    """
+    Execute one task against a worker's analyzer pool
+    """
+    if method == 'release':
+        pool.release(session_id)
+        return None
+    if method == 'stats':
+        return pool.get_stats()
+
+    with pool.checkout(session_id, profile) as analyzer, analyzer.lock:
+        return getattr(analyzer, method)(*args)
+
+
+def _worker_main(task_queue, result_queue, pool_options: Dict[str, Any]) -> None:
+    """
+    Worker process loop: owns a VisionAnalyzerPool and serves tasks until a None sentinel
+    """
+    pool = VisionAnalyzerPool(**pool_options)
+    try:
+        while True:
+            task = task_queue.get()
+            if task is None:
+                break
+
+            task_id, session_id, method, args, profile = task
+            try:
+                result_queue.put((task_id, True, _run_task(pool, session_id, method, args, profile)))
+            except Exception as e:
+                result_queue.put((task_id, False, f"{type(e).__name__}: {e}"))
+    finally:
+        pool.cleanup()
+
+
+class VisionWorkerPool:
+    """
+    Async front end for frame analysis
+
+    With `workers > 0`, each session is pinned to one worker process (so its
+    tracking state stays in one place) and tasks are sent over a queue. With
+    `workers == 0`, analysis runs on a thread pool inside the API process.
+    Either way the event loop never runs MediaPipe itself.
+    """
+
+    def __init__(
+        self,
+        workers: int = 0,
+        max_pending: int = 16,
+        task_timeout: float = 30.0,
+        pool_options: Optional[Dict[str, Any]] = None
+    ):
+        self.workers = max(0, workers)
+        self.max_pending = max(1, max_pending)
+        self.task_timeout = task_timeout
+        self.pool_options = pool_options or {}
+
+        self._processes: List[multiprocessing.Process] = []
+        self._task_queues: List[Any] = []
+        self._result_queue = None
+        self._listener: Optional[threading.Thread] = None
+        self._futures: Dict[int, asyncio.Future] = {}
+        self._pending: List[int] = [0] * max(1, self.workers)
+        self._task_ids = itertools.count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # In-process mode
+        self._local_pool: Optional[VisionAnalyzerPool] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        self._started = False
+        self._closing = False
+
+        # Counters
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def start(self) -> None:
+        """
+        Spawn worker processes (or the local thread pool). Call from the running event loop.
+        """
+        if self._started:
+            return
+        self._loop = asyncio.get_running_loop()
+
+        if self.workers == 0:
+            self._local_pool = VisionAnalyzerPool(**self.pool_options)
+            self._executor = ThreadPoolExecutor(
+                max_workers=min(4, os.cpu_count() or 1),
+                thread_name_prefix='vision'
+            )
+        else:
+            # MediaPipe graphs are not fork-safe, so always spawn fresh interpreters
+            ctx = multiprocessing.get_context('spawn')
+            self._result_queue = ctx.Queue()
+            for index in range(self.workers):
+                task_queue = ctx.Queue()
+                process = ctx.Process(
+                    target=_worker_main,
+                    args=(task_queue, self._result_queue, self.pool_options),
+                    name=f'vision-worker-{index}',
+                    daemon=True
+                )
+                process.start()
+                self._task_queues.append(task_queue)
+                self._processes.append(process)
+
+            self._listener = threading.Thread(
+                target=self._listen_for_results,
+                name='vision-results',
+                daemon=True
+            )
+            self._listener.start()
+
+        self._started = True
+        mode = f"{self.workers} worker process(es)" if self.workers else "in-process threads"
+        print(f"✅ Vision worker pool started with {mode}")
+
+    async def run(
+        self,
+        session_id: Optional[str],
+        method: str,
+        *args,
+        profile: Optional[str] = None
+    ) -> Any:
+        """
+        Run a VisionAnalyzer method for a session without blocking the event loop
+
+        Args:
+            session_id: Interview session identifier
+            method: Name of the VisionAnalyzer method to call
+            *args: Positional arguments for the method (must be picklable)
+            profile: Analysis profile for the session (None = keep its current one)
+
+        Returns:
+            The method's return value
+
+        Raises:
+            VisionPoolBusy: If the session's worker already has `max_pending` tasks
+            VisionWorkerError: If the worker raised or timed out
+        """
+        if not self._started:
+            self.start()
+        if self._closing:
+            raise VisionPoolBusy("Vision workers are shutting down")
+
+        session_id = session_id or DEFAULT_SESSION_ID
+        return await self._submit(self._worker_for(session_id), session_id, method, args, profile)
+
+    async def _submit(
+        self,
+        worker: int,
+        session_id: str,
+        method: str,
+        args: tuple,
+        profile: Optional[str] = None
+    ) -> Any:
+        if self._pending[worker] >= self.max_pending:
+            self.rejected += 1
+            raise VisionPoolBusy(f"Vision worker {worker} queue is full")
+
+        self._pending[worker] += 1
+        task_id = None
+        try:
+            if self.workers == 0:
+                future = self._loop.run_in_executor(
+                    self._executor, _run_task, self._local_pool, session_id, method, args, profile
+                )
+            else:
+                task_id = next(self._task_ids)
+                future = self._loop.create_future()
+                self._futures[task_id] = future
+                self._task_queues[worker].put((task_id, session_id, method, args, profile))
+
+            result = await asyncio.wait_for(future, timeout=self.task_timeout)
+            self.completed += 1
+            return result
+        except asyncio.TimeoutError:
+            self.failed += 1
+            raise VisionWorkerError(f"Vision task '{method}' timed out")
+        except VisionWorkerError:
+            self.failed += 1
+            raise
+        except Exception as e:
+            self.failed += 1
+            raise VisionWorkerError(f"{type(e).__name__}: {e}")
+        finally:
+            self._pending[worker] -= 1
+            if task_id is not None:
+                self._futures.pop(task_id, None)
+
+    async def release(self, session_id: Optional[str]) -> None:
+        """
+        Return a session's analyzer to its worker's pool
+        """
+        try:
+            await self.run(session_id, 'release')
+        except (VisionPoolBusy, VisionWorkerError) as e:
+            print(f"Warning: could not release vision analyzer for {session_id}: {e}")
+
+    async def get_analyzer_stats(self) -> Dict[str, Any]:
+        """
+        Collect analyzer pool counters from every worker (queued behind pending frames)
+        """
+        if not self._started:
+            self.start()
+
+        if self.workers == 0:
+            worker_stats = [self._local_pool.get_stats()]
+        else:
+            worker_stats = await asyncio.gather(*[
+                self._submit(worker, DEFAULT_SESSION_ID, 'stats', ())
+                for worker in range(self.workers)
+            ])
+
+        analyzers = merge_counters([stats.pop('analyzers') for stats in worker_stats])
+        return {
+            'pools': merge_counters(worker_stats),
+            'analyzers': VisionAnalyzer.summarize_stats(analyzers)
+        }
+
+    def load(self, session_id: Optional[str] = None) -> float:
+        """
+        Queue fullness (0-1) of the worker that serves a session
+        """
+        worker = self._worker_for(session_id or DEFAULT_SESSION_ID)
+        return min(1.0, self._pending[worker] / self.max_pending)
+
+    def queue_depth(self) -> int:
+        """
+        Total number of frames waiting or being analyzed
+        """
+        return sum(self._pending)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Queue and throughput counters (cheap; does not touch the workers)
+        """
+        return {
+            'mode': 'process' if self.workers else 'thread',
+            'workers': self.workers,
+            'alive_workers': sum(1 for p in self._processes if p.is_alive()),
+            'max_pending': self.max_pending,
+            'pending': list(self._pending),
+            'completed': self.completed,
+            'failed': self.failed,
+            'rejected': self.rejected
+        }
+
+    async def shutdown(self, timeout: float = 5.0) -> None:
+        """
+        Stop accepting work, let workers drain and release their MediaPipe graphs
+        """
+        if not self._started or self._closing:
+            return
+        self._closing = True
+
+        if self.workers == 0:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._executor.shutdown, True
+            )
+            self._local_pool.cleanup()
+            return
+
+        for task_queue in self._task_queues:
+            task_queue.put(None)
+
+        def _join():
+            for process in self._processes:
+                process.join(timeout)
+                if process.is_alive():
+                    print(f"Terminating unresponsive {process.name}")
+                    process.terminate()
+
+        await asyncio.get_running_loop().run_in_executor(None, _join)
+
+        # Stop the listener and fail anything still waiting
+        self._result_queue.put(None)
+        for future in self._futures.values():
+            if not future.done():
+                future.set_exception(VisionWorkerError("Vision workers shut down"))
+        self._futures.clear()
+        print("✅ Vision workers stopped")
+
+    def _worker_for(self, session_id: str) -> int:
+        # Stable across processes (unlike hash()), so a session always hits the same worker
+        if self.workers <= 1:
+            return 0
+        return zlib.crc32(session_id.encode('utf-8')) % self.workers
+
+    def _listen_for_results(self) -> None:
+        while True:
+            message = self._result_queue.get()
+            if message is None:
+                break
+            task_id, ok, payload = message
+            future = self._futures.pop(task_id, None)
+            if future is not None:
+                self._loop.call_soon_threadsafe(self._resolve, future, ok, payload)
+
+    @staticmethod
+    def _resolve(future: asyncio.Future, ok: bool, payload: Any) -> None:
+        if future.done():
+            return
+        if ok:
+            future.set_result(payload)
+        else:
+            future.set_exception(VisionWorkerError(payload))
@@ -0,0 +1,83 @@
+"""
+Tests for the VisionAnalyzer landmark cascade, run on a scripted engine
+
+Run from backend/:  python -m pytest tests
+"""
+import os
+import sys
+from collections import namedtuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import services.vision_analyzer as vision_analyzer
+from services.vision_analyzer import POSE_LEFT_WRIST, POSE_NOSE, POSE_RIGHT_WRIST, VisionAnalyzer
+
+
+PosePoint = namedtuple('PosePoint', ['x', 'y', 'z', 'visibility'])
+
+
+def head_and_shoulders_pose():
+    """
+    Pose of a webcam framing that cuts off at the chest: wrists off-screen
+    """
+    pose = [PosePoint(0.5, 0.6, 0.0, 0.9) for _ in range(33)]
+    pose[POSE_NOSE] = PosePoint(0.5, 0.3, 0.0, 0.99)
+    pose[POSE_LEFT_WRIST] = PosePoint(0.6, 1.3, 0.0, 0.05)
+    pose[POSE_RIGHT_WRIST] = PosePoint(0.4, 1.3, 0.0, 0.05)
+    return pose
+
+
+class ScriptedEngine:
+    """
+    Landmark engine returning a fixed pose, no face and no hands
+    """
+
+    single_pass = False
+
+    def __init__(self, **options):
+        self.calls = []
+
+    def detect_face(self, frame, timestamp):
+        self.calls.append(('face', frame.shape))
+        return None
+
+    def detect_pose(self, frame, timestamp):
+        self.calls.append(('pose', frame.shape))
+        return head_and_shoulders_pose()
+
+    def detect_hands(self, frame, timestamp):
+        self.calls.append(('hands', frame.shape))
+        return []
+
+    def reset(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_hands_due_on_carried_pose_without_wrists_searches_full_frame(monkeypatch):
+    monkeypatch.setattr(vision_analyzer, 'create_engine', lambda name, **options: ScriptedEngine())
+    analyzer = VisionAnalyzer(
+        target_long_edge=0,
+        duplicate_threshold=0,
+        stage_cadence={'pose': 3, 'hands': 2},
+        cascade=True
+    )
+    frame = np.zeros((240, 320, 3), dtype=np.uint8)
+
+    for index in range(6):
+        result = analyzer.analyze_image(frame, timestamp=index / 10)
+        assert result['gestures']['hand_detected'] is False
+        if index in (2, 4):
+            landmarks = analyzer._last_landmarks
+            assert 'pose' in landmarks.carried and 'hands' not in landmarks.carried
+            assert landmarks.hands == []
+
+    engine = analyzer.engine
+    # Frames 2 and 4: hands due on a carried pose, so they ran on the full frame
+    assert [shape for stage, shape in engine.calls if stage == 'hands'] == [frame.shape] * 2
+    assert analyzer.stats['hands_gated'] == 1
+    assert analyzer.stats['hands_cropped'] == 0
@@ -1,7 +1,8 @@
 """
 Confidence scoring and metrics calculation utilities
 """
-from typing import List, Dict, Any
+import re
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 import numpy as np
 
 
@@ -70,53 +71,53 @@ class ConfidenceScorer:
     
     @staticmethod
     def calculate_eye_contact_score(
-        gaze_scores: List[float],
-        looking_away_durations: List[float]
+        gaze_scores: Sequence[float],
+        looking_away_durations: Sequence[float]
     ) -> float:
         """
         Calculate eye contact score based on gaze tracking
         
         Args:
-            gaze_scores: List of gaze scores (0-1) from each frame
-            looking_away_durations: List of durations looking away
+            gaze_scores: Gaze scores (0-1) from each frame (list or array)
+            looking_away_durations: Durations looking away (list or array)
             
         Returns:
             Eye contact score (0-100)
         """
-        if not gaze_scores:
+        if len(gaze_scores) == 0:
             return 50.0
         
         # Base score from average gaze
-        base_score = np.mean(gaze_scores) * 100
+        base_score = np.mean(gaze_scores, dtype=np.float64) * 100
         
         # Apply penalties for looking away
-        penalty = 0
-        for duration in looking_away_durations:
-            if duration > ConfidenceScorer.LOOKING_AWAY_THRESHOLD:
-                penalty += ConfidenceScorer.LOOKING_AWAY_PENALTY
+        looking_away_count = np.count_nonzero(
+            np.asarray(looking_away_durations) > ConfidenceScorer.LOOKING_AWAY_THRESHOLD
+        )
+        penalty = int(looking_away_count) * ConfidenceScorer.LOOKING_AWAY_PENALTY
         
         final_score = base_score - penalty
         return max(0, min(100, final_score))
     
     @staticmethod
     def calculate_posture_score(
-        posture_scores: List[float],
+        posture_scores: Sequence[float],
         slouch_count: int
     ) -> float:
         """
         Calculate posture score
         
         Args:
-            posture_scores: List of posture scores (0-1) from each frame
+            posture_scores: Posture scores (0-1) from each frame (list or array)
             slouch_count: Number of times slouching was detected
             
         Returns:
             Posture score (0-100)
         """
-        if not posture_scores:
+        if len(posture_scores) == 0:
             return 50.0
         
-        base_score = np.mean(posture_scores) * 100
+        base_score = np.mean(posture_scores, dtype=np.float64) * 100
         penalty = slouch_count * ConfidenceScorer.SLOUCH_PENALTY
         
         final_score = base_score - penalty
@@ -155,28 +156,28 @@ class ConfidenceScorer:
     
     @staticmethod
     def calculate_gesture_score(
-        fidgeting_scores: List[float],
-        gesture_counts: List[int]
+        fidgeting_scores: Sequence[float],
+        gesture_counts: Sequence[int]
     ) -> float:
         """
         Calculate gesture score (lower fidgeting = higher score)
         
         Args:
-            fidgeting_scores: List of fidgeting scores (0-1) from each frame
-            gesture_counts: List of gesture counts per frame
+            fidgeting_scores: Fidgeting scores (0-1) from each frame (list or array)
+            gesture_counts: Gesture counts per frame (list or array)
             
         Returns:
             Gesture score (0-100)
         """
-        if not fidgeting_scores:
+        if len(fidgeting_scores) == 0:
             return 75.0
         
         # Lower fidgeting is better
-        avg_fidgeting = np.mean(fidgeting_scores)
+        avg_fidgeting = np.mean(fidgeting_scores, dtype=np.float64)
         base_score = (1 - avg_fidgeting) * 100
         
         # Moderate gestures are good, excessive is bad
-        avg_gestures = np.mean(gesture_counts) if gesture_counts else 0
+        avg_gestures = np.mean(gesture_counts, dtype=np.float64) if len(gesture_counts) > 0 else 0
         if avg_gestures > 5:  # Too many gestures
             penalty = (avg_gestures - 5) * 2
             base_score -= penalty
@@ -185,24 +186,24 @@ class ConfidenceScorer:
     
     @staticmethod
     def calculate_expression_score(
-        confidence_levels: List[float],
-        engagement_scores: List[float]
+        confidence_levels: Sequence[float],
+        engagement_scores: Sequence[float]
     ) -> float:
         """
         Calculate expression score based on facial expressions
         
         Args:
-            confidence_levels: List of confidence levels (0-1) from each frame
-            engagement_scores: List of engagement scores (0-1) from each frame
+            confidence_levels: Confidence levels (0-1) from each frame (list or array)
+            engagement_scores: Engagement scores (0-1) from each frame (list or array)
             
         Returns:
             Expression score (0-100)
         """
-        if not confidence_levels or not engagement_scores:
+        if len(confidence_levels) == 0 or len(engagement_scores) == 0:
             return 60.0
         
-        avg_confidence = np.mean(confidence_levels)
-        avg_engagement = np.mean(engagement_scores)
+        avg_confidence = np.mean(confidence_levels, dtype=np.float64)
+        avg_engagement = np.mean(engagement_scores, dtype=np.float64)
         
         # Weighted combination
         score = (avg_confidence * 0.6 + avg_engagement * 0.4) * 100
@@ -214,6 +215,10 @@ class ConfidenceScorer:
         """
         Aggregate metrics from all frames in a session
         
+        The frame dicts are converted once to one NumPy column per metric
+        (frames missing a section are left out of that section's columns) and
+        scored by `aggregate_frame_columns`.
+        
         Args:
             frame_metrics: List of frame analysis results
             
@@ -229,52 +234,74 @@ class ConfidenceScorer:
                 'overall_confidence': 58.75
             }
         
-        # Extract metrics from frames
+        # Convert the frame dicts to columns in a single pass
         gaze_scores = []
         looking_away_durations = []
         posture_scores = []
-        slouch_count = 0
+        slouch_flags = []
         fidgeting_scores = []
         gesture_counts = []
         confidence_levels = []
         engagement_scores = []
         
         for frame in frame_metrics:
-            if 'eye_contact' in frame:
-                gaze_scores.append(frame['eye_contact'].get('gaze_score', 0.5))
-                looking_away_durations.append(
-                    frame['eye_contact'].get('looking_away_duration', 0)
-                )
+            eye_contact = frame.get('eye_contact')
+            if eye_contact is not None:
+                gaze_scores.append(eye_contact.get('gaze_score', 0.5))
+                looking_away_durations.append(eye_contact.get('looking_away_duration', 0))
             
-            if 'posture' in frame:
-                posture_scores.append(frame['posture'].get('posture_score', 0.5))
-                if frame['posture'].get('slouch_detected', False):
-                    slouch_count += 1
+            posture = frame.get('posture')
+            if posture is not None:
+                posture_scores.append(posture.get('posture_score', 0.5))
+                slouch_flags.append(posture.get('slouch_detected', False))
             
-            if 'gestures' in frame:
-                fidgeting_scores.append(frame['gestures'].get('fidgeting_score', 0.3))
-                gesture_counts.append(frame['gestures'].get('gesture_count', 0))
+            gestures = frame.get('gestures')
+            if gestures is not None:
+                fidgeting_scores.append(gestures.get('fidgeting_score', 0.3))
+                gesture_counts.append(gestures.get('gesture_count', 0))
             
-            if 'expressions' in frame:
-                confidence_levels.append(
-                    frame['expressions'].get('confidence_level', 0.6)
-                )
-                engagement_scores.append(
-                    frame['expressions'].get('engagement_score', 0.6)
-                )
-        
-        # Calculate individual scores
+            expressions = frame.get('expressions')
+            if expressions is not None:
+                confidence_levels.append(expressions.get('confidence_level', 0.6))
+                engagement_scores.append(expressions.get('engagement_score', 0.6))
+        
+        return ConfidenceScorer.aggregate_frame_columns({
+            'gaze_score': np.array(gaze_scores, dtype=np.float64),
+            'looking_away_duration': np.array(looking_away_durations, dtype=np.float64),
+            'posture_score': np.array(posture_scores, dtype=np.float64),
+            'slouch_detected': np.array(slouch_flags, dtype=bool),
+            'fidgeting_score': np.array(fidgeting_scores, dtype=np.float64),
+            'gesture_count': np.array(gesture_counts, dtype=np.float64),
+            'confidence_level': np.array(confidence_levels, dtype=np.float64),
+            'engagement_score': np.array(engagement_scores, dtype=np.float64)
+        })
+    
+    @staticmethod
+    def aggregate_frame_columns(columns: Optional[Dict[str, np.ndarray]]) -> Dict[str, float]:
+        """
+        Aggregate session metrics from columnar frame metrics with vectorized NumPy
+        
+        Args:
+            columns: Column name -> array (see services.session_metrics.FRAME_COLUMNS);
+                only the scored columns are read, and sections may differ in length
+            
+        Returns:
+            Aggregated metrics dictionary
+        """
+        if columns is None or not any(len(values) for values in columns.values()):
+            return ConfidenceScorer.aggregate_session_metrics([])
+        
         eye_contact_score = ConfidenceScorer.calculate_eye_contact_score(
-            gaze_scores, looking_away_durations
+            columns['gaze_score'], columns['looking_away_duration']
         )
         posture_score = ConfidenceScorer.calculate_posture_score(
-            posture_scores, slouch_count
+            columns['posture_score'], int(np.count_nonzero(columns['slouch_detected']))
         )
         gesture_score = ConfidenceScorer.calculate_gesture_score(
-            fidgeting_scores, gesture_counts
+            columns['fidgeting_score'], columns['gesture_count']
         )
         expression_score = ConfidenceScorer.calculate_expression_score(
-            confidence_levels, engagement_scores
+            columns['confidence_level'], columns['engagement_score']
         )
         
         return {
@@ -283,6 +310,335 @@ class ConfidenceScorer:
             'expression_confidence': expression_score,
             'gesture_score': gesture_score
         }
+    
+    @staticmethod
+    def segment_frame_columns(
+        columns: Optional[Dict[str, np.ndarray]],
+        segments: Sequence[Tuple[float, float]]
+    ) -> List[Dict[str, float]]:
+        """
+        Aggregate columnar frame metrics per time segment (e.g. per question)
+        
+        Segment bounds are located with a binary search on the sorted timestamp
+        column, so the frames are bucketed in one pass and each segment is
+        scored from a contiguous slice.
+        
+        Args:
+            columns: Column name -> array (see services.session_metrics.FRAME_COLUMNS),
+                all of equal length and including 'timestamp'
+            segments: (start, end) timestamps; a frame belongs to a segment when
+                start <= timestamp < end
+            
+        Returns:
+            One `aggregate_frame_columns` result per segment, plus 'frames_analyzed'
+        """
+        if columns is None or len(columns['timestamp']) == 0:
+            return [
+                {**ConfidenceScorer.aggregate_frame_columns(None), 'frames_analyzed': 0}
+                for _ in segments
+            ]
+        
+        timestamps = columns['timestamp']
+        if np.any(timestamps[1:] < timestamps[:-1]):
+            order = np.argsort(timestamps, kind='stable')
+            columns = {name: values[order] for name, values in columns.items()}
+            timestamps = columns['timestamp']
+        
+        bounds = np.asarray(segments, dtype=np.float64).reshape(-1, 2)
+        starts = np.searchsorted(timestamps, bounds[:, 0], side='left')
+        ends = np.maximum(starts, np.searchsorted(timestamps, bounds[:, 1], side='left'))
+        
+        results = []
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            segment = {name: values[start:end] for name, values in columns.items()}
+            results.append({
+                **ConfidenceScorer.aggregate_frame_columns(segment),
+                'frames_analyzed': end - start
+            })
+        return results
+
+
+class RunningStat:
+    """
+    Running count, mean and variance of a stream of values (Welford's algorithm)
+    """
+    
+    __slots__ = ('count', 'mean', '_m2')
+    
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+    
+    def update(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+    
+    @property
+    def variance(self) -> float:
+        """
+        Population variance (0 until two values have been seen)
+        """
+        return self._m2 / self.count if self.count > 1 else 0.0
+    
+    @property
+    def std(self) -> float:
+        return self.variance ** 0.5
+
+
+class EyeContactAccumulator:
+    """
+    Online eye contact score: running gaze mean and looking-away penalty tally
+    """
+    
+    def __init__(self):
+        self.gaze = RunningStat()
+        self.looking_away_count = 0
+    
+    def update(self, eye_contact: Dict[str, Any]) -> None:
+        self.gaze.update(eye_contact.get('gaze_score', 0.5))
+        if eye_contact.get('looking_away_duration', 0) > ConfidenceScorer.LOOKING_AWAY_THRESHOLD:
+            self.looking_away_count += 1
+    
+    def score(self) -> float:
+        if self.gaze.count == 0:
+            return 50.0
+        penalty = self.looking_away_count * ConfidenceScorer.LOOKING_AWAY_PENALTY
+        return max(0, min(100, self.gaze.mean * 100 - penalty))
+
+
+class PostureAccumulator:
+    """
+    Online posture score: running posture mean and slouch tally
+    """
+    
+    def __init__(self):
+        self.posture = RunningStat()
+        self.slouch_count = 0
+    
+    def update(self, posture: Dict[str, Any]) -> None:
+        self.posture.update(posture.get('posture_score', 0.5))
+        if posture.get('slouch_detected', False):
+            self.slouch_count += 1
+    
+    def score(self) -> float:
+        if self.posture.count == 0:
+            return 50.0
+        penalty = self.slouch_count * ConfidenceScorer.SLOUCH_PENALTY
+        return max(0, min(100, self.posture.mean * 100 - penalty))
+
+
+class GestureAccumulator:
+    """
+    Online gesture score: running fidgeting and gesture-count means
+    """
+    
+    def __init__(self):
+        self.fidgeting = RunningStat()
+        self.gesture_count = RunningStat()
+    
+    def update(self, gestures: Dict[str, Any]) -> None:
+        self.fidgeting.update(gestures.get('fidgeting_score', 0.3))
+        self.gesture_count.update(gestures.get('gesture_count', 0))
+    
+    def score(self) -> float:
+        if self.fidgeting.count == 0:
+            return 75.0
+        score = (1 - self.fidgeting.mean) * 100
+        if self.gesture_count.mean > 5:
+            score -= (self.gesture_count.mean - 5) * 2
+        return max(0, min(100, score))
+
+
+class ExpressionAccumulator:
+    """
+    Online expression score: running confidence and engagement means
+    """
+    
+    def __init__(self):
+        self.confidence = RunningStat()
+        self.engagement = RunningStat()
+    
+    def update(self, expressions: Dict[str, Any]) -> None:
+        self.confidence.update(expressions.get('confidence_level', 0.6))
+        self.engagement.update(expressions.get('engagement_score', 0.6))
+    
+    def score(self) -> float:
+        if self.confidence.count == 0:
+            return 60.0
+        return max(0, min(100, (self.confidence.mean * 0.6 + self.engagement.mean * 0.4) * 100))
+
+
+class SessionScoreAccumulator:
+    """
+    Constant-memory session scoring, updated one frame at a time
+    
+    `aggregate()` gives the same result as `aggregate_session_metrics` over
+    every frame seen so far (up to floating-point rounding), without keeping
+    the frames.
+    """
+    
+    def __init__(self):
+        self.frames = 0
+        self.eye_contact = EyeContactAccumulator()
+        self.posture = PostureAccumulator()
+        self.gestures = GestureAccumulator()
+        self.expressions = ExpressionAccumulator()
+    
+    def update(self, frame: Dict[str, Any]) -> None:
+        """
+        Add one frame analysis result (sections it lacks are skipped, as in batch scoring)
+        """
+        self.frames += 1
+        if frame.get('eye_contact') is not None:
+            self.eye_contact.update(frame['eye_contact'])
+        if frame.get('posture') is not None:
+            self.posture.update(frame['posture'])
+        if frame.get('gestures') is not None:
+            self.gestures.update(frame['gestures'])
+        if frame.get('expressions') is not None:
+            self.expressions.update(frame['expressions'])
+    
+    def aggregate(self) -> Dict[str, float]:
+        """
+        Current aggregated metrics, shaped like `aggregate_session_metrics`
+        """
+        if self.frames == 0:
+            return ConfidenceScorer.aggregate_session_metrics([])
+        
+        return {
+            'eye_contact_percentage': self.eye_contact.score(),
+            'posture_score': self.posture.score(),
+            'expression_confidence': self.expressions.score(),
+            'gesture_score': self.gestures.score()
+        }
+    
+    def variability(self) -> Dict[str, float]:
+        """
+        Standard deviation of the per-frame scores (0-1 scales) so far
+        """
+        return {
+            'gaze_score_std': self.eye_contact.gaze.std,
+            'posture_score_std': self.posture.posture.std,
+            'fidgeting_score_std': self.gestures.fidgeting.std,
+            'confidence_level_std': self.expressions.confidence.std,
+            'engagement_score_std': self.expressions.engagement.std
+        }
+
+
+def summarize_frame_batch(frame_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Summarize a batch of frame analysis results with vectorized NumPy
+    
+    Args:
+        frame_results: Non-empty list of VisionAnalyzer results
+        
+    Returns:
+        Batch summary (ratios are 0-1, overall confidence is 0-100)
+    """
+    def column(section: str, key: str, dtype=np.float64) -> np.ndarray:
+        return np.fromiter(
+            (frame[section][key] for frame in frame_results),
+            dtype=dtype,
+            count=len(frame_results)
+        )
+    
+    timestamps = np.fromiter((frame['timestamp'] for frame in frame_results), dtype=np.float64)
+    overall = np.fromiter((frame['overall_confidence'] for frame in frame_results), dtype=np.float64)
+    
+    return {
+        'frames_analyzed': len(frame_results),
+        'start_timestamp': float(timestamps.min()),
+        'end_timestamp': float(timestamps.max()),
+        'eye_contact_ratio': float(column('eye_contact', 'is_looking_at_camera', bool).mean()),
+        'average_gaze_score': float(column('eye_contact', 'gaze_score').mean()),
+        'average_posture_score': float(column('posture', 'posture_score').mean()),
+        'slouch_ratio': float(column('posture', 'slouch_detected', bool).mean()),
+        'average_fidgeting_score': float(column('gestures', 'fidgeting_score').mean()),
+        'hand_detected_ratio': float(column('gestures', 'hand_detected', bool).mean()),
+        'average_confidence_level': float(column('expressions', 'confidence_level').mean()),
+        'average_engagement_score': float(column('expressions', 'engagement_score').mean()),
+        'average_overall_confidence': float(overall.mean())
+    }
+
+
+FILLER_WORDS = (
+    'um', 'uh', 'like', 'you know', 'so', 'actually',
+    'basically', 'literally', 'right', 'okay', 'well',
+    'i mean', 'kind of', 'sort of'
+)
+
+
+def _filler_trie_pattern(fillers: Sequence[str]) -> str:
+    """
+    Regex alternation of the fillers factored into a prefix trie, so at each
+    word start the matcher follows one branch instead of trying every filler
+    ("so" and "sort of" share one "so" branch; the longest filler wins)
+    """
+    trie: Dict[str, Any] = {}
+    for filler in fillers:
+        node = trie
+        for char in filler:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    
+    def branch(node: Dict[str, Any]) -> str:
+        alternatives = [
+            (r'\s+' if char == ' ' else re.escape(char)) + branch(child)
+            for char, child in sorted(node.items()) if char
+        ]
+        if not alternatives:
+            return ''
+        body = alternatives[0] if len(alternatives) == 1 else '(?:' + '|'.join(alternatives) + ')'
+        return '(?:' + body + ')?' if '' in node else body
+    
+    return r'\b' + branch(trie) + r'\b'
+
+
+# Word boundaries keep "so" out of "also" and "like" out of "likely";
+# multi-word fillers match across any run of whitespace
+_FILLER_PATTERN = re.compile(_filler_trie_pattern(FILLER_WORDS))
+
+# Case-insensitive fallback with one group per filler (longest first), so the
+# group index names the filler even when the matched text does not lowercase to it
+_FILLER_ORDER = sorted(FILLER_WORDS, key=len, reverse=True)
+_FILLER_PATTERN_ANY_CASE = re.compile(
+    r'\b(?:' + '|'.join(
+        '(' + r'\s+'.join(re.escape(part) for part in filler.split()) + ')'
+        for filler in _FILLER_ORDER
+    ) + r')\b',
+    re.IGNORECASE
+)
+
+
+def find_filler_words(text: str) -> List[Tuple[str, int, int]]:
+    """
+    Find filler words in a single pass over the text
+    
+    Args:
+        text: Transcribed text
+        
+    Returns:
+        (filler, start, end) for each occurrence, in text order; offsets index into `text`
+    """
+    # Matching lowercased text is about twice as fast as IGNORECASE, and the
+    # offsets still line up whenever lowercasing kept every character's length
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        return [
+            (_FILLER_ORDER[match.lastindex - 1], match.start(), match.end())
+            for match in _FILLER_PATTERN_ANY_CASE.finditer(text)
+        ]
+    
+    occurrences = []
+    for match in _FILLER_PATTERN.finditer(lowered):
+        matched = match.group()
+        # Multi-word fillers may have matched across newlines or repeated spaces
+        filler = matched if matched in FILLER_WORDS else ' '.join(matched.split())
+        occurrences.append((filler, match.start(), match.end()))
+    return occurrences
 
 
 def detect_filler_words(text: str) -> Dict[str, Any]:
@@ -293,28 +649,24 @@ def detect_filler_words(text: str) -> Dict[str, Any]:
         text: Transcribed text
         
     Returns:
-        Dictionary with filler word analysis
+        Dictionary with filler word analysis: per-filler counts and
+        (start, end) character offsets, total count, total words and percentage
     """
-    filler_words_list = [
-        'um', 'uh', 'like', 'you know', 'so', 'actually', 
-        'basically', 'literally', 'right', 'okay', 'well',
-        'i mean', 'kind of', 'sort of'
-    ]
+    words = text.split()
     
-    text_lower = text.lower()
-    words = text_lower.split()
+    filler_analysis: Dict[str, int] = {}
+    filler_offsets: Dict[str, List[Tuple[int, int]]] = {}
     
-    filler_analysis = {}
-    total_filler_count = 0
+    occurrences = find_filler_words(text)
+    for filler, start, end in occurrences:
+        filler_analysis[filler] = filler_analysis.get(filler, 0) + 1
+        filler_offsets.setdefault(filler, []).append((start, end))
     
-    for filler in filler_words_list:
-        count = text_lower.count(filler)
-        if count > 0:
-            filler_analysis[filler] = count
-            total_filler_count += count
+    total_filler_count = len(occurrences)
     
     return {
         'filler_words': filler_analysis,
+        'filler_offsets': filler_offsets,
         'total_filler_count': total_filler_count,
         'total_words': len(words),
         'filler_percentage': (total_filler_count / len(words) * 100) if words else 0
@@ -336,3 +688,163 @@ def calculate_speech_pace(word_count: int, duration_seconds: float) -> float:
         return 0.0
     
     return (word_count / duration_seconds) * 60
+
+
+def transcription_result(
+    text: str,
+    duration: float,
+    word_count: Optional[int] = None,
+    error: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Result dictionary every transcription backend returns
+    
+    Args:
+        text: Transcribed text
+        duration: Audio duration in seconds
+        word_count: Words spoken (counted from the text if not given)
+        error: Set when transcription failed (text is then a placeholder)
+        
+    Returns:
+        Dictionary with transcription and speech metrics
+    """
+    filler_analysis = detect_filler_words(text)
+    if word_count is None:
+        word_count = filler_analysis['total_words']
+    
+    result = {
+        'text': text,
+        'duration': duration,
+        'word_count': word_count,
+        'words_per_minute': calculate_speech_pace(word_count, duration),
+        'filler_words': filler_analysis['filler_words'],
+        'filler_offsets': filler_analysis['filler_offsets'],
+        'total_filler_count': filler_analysis['total_filler_count'],
+        'filler_percentage': filler_analysis['filler_percentage']
+    }
+    if error is not None:
+        result['error'] = error
+    return result
+
+
+def analyze_speech_patterns(transcriptions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Analyze speech patterns across multiple transcriptions
+    
+    Pace is measured over speaking time when a result has a locally measured
+    `speaking_duration` (see services.audio_analysis), otherwise over its
+    whole duration.
+    
+    Args:
+        transcriptions: List of transcription results
+        
+    Returns:
+        Aggregated speech metrics
+    """
+    if not transcriptions:
+        return {
+            'total_words': 0,
+            'average_wpm': 0.0,
+            'total_filler_count': 0,
+            'filler_percentage': 0.0,
+            'total_pauses': 0,
+            'clarity_score': 50.0
+        }
+    
+    total_words = sum(t.get('word_count', 0) for t in transcriptions)
+    total_duration = sum(t.get('speaking_duration', t.get('duration', 0)) for t in transcriptions)
+    total_filler_count = sum(t.get('total_filler_count', 0) for t in transcriptions)
+    total_pauses = sum(t.get('pauses_count', 0) for t in transcriptions)
+    
+    average_wpm = calculate_speech_pace(total_words, total_duration)
+    filler_percentage = (total_filler_count / total_words * 100) if total_words > 0 else 0
+    
+    # Calculate clarity score
+    # Ideal WPM: 120-160, penalize for filler words
+    optimal_wpm = 140
+    wpm_score = 100 - min(50, abs(average_wpm - optimal_wpm) / 2)
+    filler_penalty = filler_percentage * 2
+    clarity_score = max(0, min(100, wpm_score - filler_penalty))
+    
+    return {
+        'total_words': total_words,
+        'average_wpm': average_wpm,
+        'total_filler_count': total_filler_count,
+        'filler_percentage': filler_percentage,
+        'total_pauses': total_pauses,
+        'clarity_score': clarity_score
+    }
+
+
+class SpeechStatsAccumulator:
+    """
+    Filler and pace stats for an answer transcribed piece by piece
+    
+    Each `update` scans only the new text; filler offsets index into the
+    joined transcript (pieces joined with single spaces).
+    """
+    
+    def __init__(self):
+        self.parts: List[str] = []
+        self.duration = 0.0
+        self.speaking_duration = 0.0
+        self.pauses_count = 0
+        self.word_count = 0
+        self.filler_words: Dict[str, int] = {}
+        self.filler_offsets: Dict[str, List[Tuple[int, int]]] = {}
+        self.total_filler_count = 0
+        self._length = 0
+    
+    @property
+    def text(self) -> str:
+        return ' '.join(self.parts)
+    
+    def update(
+        self,
+        text: str,
+        duration: float,
+        word_count: Optional[int] = None,
+        speaking_duration: Optional[float] = None,
+        pauses_count: int = 0
+    ) -> None:
+        """
+        Add the next transcribed piece
+        
+        Args:
+            text: Transcribed text of the piece
+            duration: Seconds of audio in the piece
+            word_count: Words in the piece (counted from the text if not given)
+            speaking_duration: Measured speaking time in the piece (all of it if not given)
+            pauses_count: Measured pauses in the piece
+        """
+        base = self._length + 1 if self.parts else 0
+        self.parts.append(text)
+        self._length = base + len(text)
+        self.duration += duration
+        self.speaking_duration += duration if speaking_duration is None else speaking_duration
+        self.pauses_count += pauses_count
+        
+        filler_analysis = detect_filler_words(text)
+        self.word_count += filler_analysis['total_words'] if word_count is None else word_count
+        for filler, offsets in filler_analysis['filler_offsets'].items():
+            self.filler_words[filler] = self.filler_words.get(filler, 0) + len(offsets)
+            self.filler_offsets.setdefault(filler, []).extend(
+                (base + start, base + end) for start, end in offsets
+            )
+        self.total_filler_count += filler_analysis['total_filler_count']
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Stats over everything transcribed so far
+        """
+        return {
+            'duration': self.duration,
+            'speaking_duration': self.speaking_duration,
+            'pauses_count': self.pauses_count,
+            'word_count': self.word_count,
+            'words_per_minute': calculate_speech_pace(self.word_count, self.speaking_duration),
+            'filler_words': dict(self.filler_words),
+            'filler_offsets': {filler: list(offsets) for filler, offsets in self.filler_offsets.items()},
+            'total_filler_count': self.total_filler_count,
+            'filler_percentage': (self.total_filler_count / self.word_count * 100) if self.word_count else 0
+        }
@@ -27,6 +27,8 @@ const InterviewDashboard = () => {
   const mediaRecorderRef = useRef(null);
   const audioChunksRef = useRef([]);
   const frameIntervalRef = useRef(null);
+  const answerEndRef = useRef(0);
+  const sessionStartRef = useRef(null);
 
   // State management
   const [stream, setStream] = useState(null);
@@ -58,8 +60,9 @@ const InterviewDashboard = () => {
   const [isAnalyzing, setIsAnalyzing] = useState(false);
   const [isEndingSession, setIsEndingSession] = useState(false);
 
-  const [frameMetrics, setFrameMetrics] = useState([]);
+  const [framesAnalyzed, setFramesAnalyzed] = useState(0);
   const [transcriptions, setTranscriptions] = useState([]);
+  const [questionSegments, setQuestionSegments] = useState([]);
 
   // Initialize camera and microphone
   useEffect(() => {
@@ -86,7 +89,8 @@ const InterviewDashboard = () => {
         stream.getTracks().forEach(track => track.stop());
       }
       if (frameIntervalRef.current) {
-        clearInterval(frameIntervalRef.current);
+        clearTimeout(frameIntervalRef.current);
+        frameIntervalRef.current = null;
       }
     };
   }, []);
@@ -117,8 +121,15 @@ const InterviewDashboard = () => {
     setShowResumeUpload(false);
   };
 
+  // Seconds since the session started, read live (closures must not capture
+  // sessionDuration); frame timestamps and answer windows share this clock
+  const sessionTime = () => (
+    sessionStartRef.current === null ? 0 : (performance.now() - sessionStartRef.current) / 1000
+  );
+
   // Start session and load first question
   const startSession = async () => {
+    sessionStartRef.current = performance.now();
     setSessionStarted(true);
     await loadNextQuestion();
     startFrameAnalysis();
@@ -161,6 +172,9 @@ const InterviewDashboard = () => {
 
     audioChunksRef.current = [];
     const mediaRecorder = new MediaRecorder(stream);
+    // Answer window on the same clock as frame timestamps
+    const answerStart = sessionTime();
+    const question = currentQuestion?.question;
     
     mediaRecorder.ondataavailable = (event) => {
       if (event.data.size > 0) {
@@ -170,7 +184,11 @@ const InterviewDashboard = () => {
 
     mediaRecorder.onstop = async () => {
       const audioBlob = new Blob(audioChunksRef.current, { type: 'audio/webm' });
-      await processRecording(audioBlob);
+      await processRecording(audioBlob, {
+        question,
+        start_time: answerStart,
+        end_time: answerEndRef.current
+      });
     };
 
     mediaRecorder.start();
@@ -181,13 +199,14 @@ const InterviewDashboard = () => {
   // Stop recording answer
   const stopRecording = () => {
     if (mediaRecorderRef.current && isRecording) {
+      answerEndRef.current = sessionTime();
       mediaRecorderRef.current.stop();
       setIsRecording(false);
     }
   };
 
   // Process recorded answer
-  const processRecording = async (audioBlob) => {
+  const processRecording = async (audioBlob, segment) => {
     try {
       console.log('Processing audio recording...', audioBlob.size, 'bytes');
       
@@ -201,10 +220,11 @@ const InterviewDashboard = () => {
       const audioBase64 = await blobToBase64(audioBlob);
       console.log('Audio converted to base64, length:', audioBase64.length);
       
-      const transcription = await apiService.transcribeAudio(audioBase64, 'webm');
+      const transcription = await apiService.transcribeAudio(audioBase64, 'webm', sessionId);
       console.log('Transcription result:', transcription);
       
       setTranscriptions(prev => [...prev, transcription.text]);
+      setQuestionSegments(prev => [...prev, { ...segment, transcription: transcription.text }]);
       
       // Count filler words
       const fillerWordMatches = transcription.text.match(/\b(um|uh|like|you know|so|basically|actually)\b/gi) || [];
@@ -224,6 +244,7 @@ const InterviewDashboard = () => {
       console.error('Error details:', error.response?.data || error.message);
       // Still increment question count even if transcription fails
       setQuestionsAnswered(prev => prev + 1);
+      setQuestionSegments(prev => [...prev, segment]);
     }
   };
 
@@ -232,6 +253,9 @@ const InterviewDashboard = () => {
     console.log('Starting frame analysis...');
     setIsAnalyzing(true);
     
+    // Default gap between frames until the server recommends one
+    let nextDelay = 3000;
+    
     // Function to analyze a single frame
     const analyzeFrame = async () => {
       if (videoRef.current) {
@@ -243,12 +267,17 @@ const InterviewDashboard = () => {
             return;
           }
           
-          const timestamp = sessionDuration;
-          console.log(`Analyzing frame at ${timestamp}s...`);
+          const timestamp = sessionTime();
+          console.log(`Analyzing frame at ${timestamp.toFixed(1)}s...`);
           
-          const analysis = await apiService.analyzeFrame(frameBase64, timestamp);
+          const analysis = await apiService.analyzeFrame(frameBase64, timestamp, sessionId);
           console.log('Frame analysis result:', analysis);
           
+          // The server paces each session by its load and how much the metrics change
+          if (analysis.recommended_interval_ms) {
+            nextDelay = analysis.recommended_interval_ms;
+          }
+          
           // Update real-time metrics
           setMetrics(prev => ({
             ...prev,
@@ -258,26 +287,33 @@ const InterviewDashboard = () => {
             gestureScore: Math.round((1 - analysis.gestures.fidgeting_score) * 100)
           }));
 
-          // Store frame metrics for final report
-          setFrameMetrics(prev => [...prev, {
-            eye_contact: analysis.eye_contact,
-            posture: analysis.posture,
-            gestures: analysis.gestures,
-            expressions: analysis.expressions,
-            timestamp: analysis.timestamp
-          }]);
+          // The server keeps each frame's metrics for the final report
+          setFramesAnalyzed(prev => prev + 1);
         } catch (error) {
-          console.error('Error analyzing frame:', error);
-          console.error('Error details:', error.response?.data || error.message);
+          if (error.response?.status === 429) {
+            // Sent too soon: wait as long as the server asks
+            const retryAfter = Number(error.response.headers?.['retry-after']);
+            if (retryAfter > 0) {
+              nextDelay = retryAfter * 1000;
+            }
+          } else {
+            console.error('Error analyzing frame:', error);
+            console.error('Error details:', error.response?.data || error.message);
+          }
         }
       }
     };
     
-    // Analyze first frame immediately
-    setTimeout(() => analyzeFrame(), 1000);
+    // Analyze one frame, then schedule the next (stops once the ref is cleared)
+    const analyzeAndSchedule = async () => {
+      await analyzeFrame();
+      if (frameIntervalRef.current) {
+        frameIntervalRef.current = setTimeout(analyzeAndSchedule, nextDelay);
+      }
+    };
     
-    // Then analyze every 3 seconds
-    frameIntervalRef.current = setInterval(analyzeFrame, 3000);
+    // Analyze first frame after a short delay
+    frameIntervalRef.current = setTimeout(analyzeAndSchedule, 1000);
   };
 
   // End session and navigate to report
@@ -287,7 +323,7 @@ const InterviewDashboard = () => {
       sessionId,
       sessionDuration,
       questionsAnswered,
-      frameMetricsCount: frameMetrics.length,
+      framesAnalyzed,
       transcriptionsCount: transcriptions.length
     });
     
@@ -295,7 +331,7 @@ const InterviewDashboard = () => {
     setIsAnalyzing(false);
     
     if (frameIntervalRef.current) {
-      clearInterval(frameIntervalRef.current);
+      clearTimeout(frameIntervalRef.current);
       frameIntervalRef.current = null;
     }
 
@@ -305,26 +341,14 @@ const InterviewDashboard = () => {
     }
 
     try {
-      // Ensure we have at least some frame metrics
-      if (frameMetrics.length === 0) {
-        console.warn('No frame metrics collected, using default values');
-        // Add a default frame metric to prevent backend errors
-        frameMetrics.push({
-          eye_contact: { is_looking_at_camera: true, gaze_score: 0.75, looking_away_duration: 0 },
-          posture: { is_upright: true, posture_score: 0.7, slouch_detected: false, shoulder_alignment: 0.8 },
-          gestures: { hand_detected: false, gesture_count: 0, fidgeting_score: 0.2, hand_positions: [] },
-          expressions: { confidence_level: 0.7, smile_detected: false, expression_type: 'neutral', engagement_score: 0.7 },
-          timestamp: 0
-        });
-      }
-
+      // Frame metrics are already on the server, recorded under sessionId
       const sessionData = {
         session_id: sessionId,
         total_duration: sessionDuration,
-        frames_analyzed: frameMetrics.length,
+        frames_analyzed: framesAnalyzed,
         questions_answered: questionsAnswered,
         transcriptions: transcriptions,
-        frame_metrics: frameMetrics
+        question_segments: questionSegments
       };
 
       console.log('Sending session data to backend:', sessionData);
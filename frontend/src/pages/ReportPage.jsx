@@ -66,6 +66,7 @@ const ReportPage = () => {
   }
 
   const { metrics, detailed_feedback, strengths, areas_for_improvement, recommendations, timestamp, duration } = report;
+  const questionBreakdown = report.question_breakdown || [];
 
   // Prepare chart data
   const radarData = [
@@ -494,6 +495,46 @@ const ReportPage = () => {
           </div>
         </motion.div>
 
+        {/* Per-Question Breakdown */}
+        {questionBreakdown.length > 0 && (
+          <motion.div
+            initial={{ opacity: 0, y: 20 }}
+            animate={{ opacity: 1, y: 0 }}
+            transition={{ delay: 0.55 }}
+            className="card mb-8 overflow-x-auto"
+          >
+            <h3 className="text-2xl font-bold mb-4 text-slate-800">Question by Question</h3>
+            <table className="w-full text-sm text-left">
+              <thead>
+                <tr className="text-slate-500 border-b border-slate-200">
+                  <th className="py-2 pr-4">Question</th>
+                  <th className="py-2 pr-4">Eye Contact</th>
+                  <th className="py-2 pr-4">Posture</th>
+                  <th className="py-2 pr-4">Gestures</th>
+                  <th className="py-2 pr-4">Expression</th>
+                  <th className="py-2 pr-4">Filler Words</th>
+                  <th className="py-2">Overall</th>
+                </tr>
+              </thead>
+              <tbody>
+                {questionBreakdown.map((item) => (
+                  <tr key={item.question_index} className="border-b border-slate-100 text-slate-700">
+                    <td className="py-2 pr-4 max-w-xs truncate" title={item.question || ''}>
+                      {item.question || `Question ${item.question_index + 1}`}
+                    </td>
+                    <td className="py-2 pr-4">{item.eye_contact_percentage.toFixed(0)}%</td>
+                    <td className="py-2 pr-4">{item.posture_score.toFixed(0)}%</td>
+                    <td className="py-2 pr-4">{item.gesture_score.toFixed(0)}%</td>
+                    <td className="py-2 pr-4">{item.expression_confidence.toFixed(0)}%</td>
+                    <td className="py-2 pr-4">{item.filler_word_count}</td>
+                    <td className="py-2 font-semibold">{item.overall_confidence.toFixed(0)}%</td>
+                  </tr>
+                ))}
+              </tbody>
+            </table>
+          </motion.div>
+        )}
+
         {/* Feedback Section */}
         <motion.div
           initial={{ opacity: 0, y: 20 }}
@@ -28,11 +28,12 @@ export const apiService = {
   },
 
   // Transcribe audio
-  transcribeAudio: async (audioBase64, format = 'webm') => {
+  transcribeAudio: async (audioBase64, format = 'webm', sessionId = null) => {
     try {
       const response = await api.post('/api/transcribe-audio', {
         audio_base64: audioBase64,
         format: format,
+        session_id: sessionId,
       });
       return response.data;
     } catch (error) {
@@ -57,11 +58,12 @@ export const apiService = {
   },
 
   // Analyze video frame
-  analyzeFrame: async (frameBase64, timestamp) => {
+  analyzeFrame: async (frameBase64, timestamp, sessionId = null) => {
     try {
       const response = await api.post('/api/analyze-frame', {
         frame_base64: frameBase64,
         timestamp: timestamp,
+        session_id: sessionId,
       });
       return response.data;
     } catch (error) {